@@ -0,0 +1,345 @@
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+from contextlib import contextmanager
+from .metrics import stage, registry
+import threading
+import logging
+import atexit
+import time
+import os
+
+# Optional: process-tree teardown, RSS limits and the orphan watchdog need psutil
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+# Pool settings (overridable via environment)
+BROWSER_POOL_SIZE = int(os.environ.get('BROWSER_POOL_SIZE', '3'))
+BROWSER_MAX_PAGES = int(os.environ.get('BROWSER_MAX_PAGES', '50'))
+BROWSER_CHECKOUT_TIMEOUT = float(os.environ.get('BROWSER_CHECKOUT_TIMEOUT', '60'))
+# Supervision: hard limits on a page load / script, and on a browser's memory (0 = no limit)
+BROWSER_PAGE_LOAD_TIMEOUT = float(os.environ.get('BROWSER_PAGE_LOAD_TIMEOUT', '30'))
+BROWSER_SCRIPT_TIMEOUT = float(os.environ.get('BROWSER_SCRIPT_TIMEOUT', '10'))
+BROWSER_MAX_RSS_MB = float(os.environ.get('BROWSER_MAX_RSS_MB', '600'))
+BROWSER_WATCHDOG_INTERVAL = float(os.environ.get('BROWSER_WATCHDOG_INTERVAL', '30'))
+# 1 = launch Chrome without images, web fonts or extensions
+BROWSER_LITE_PROFILE = os.environ.get('BROWSER_LITE_PROFILE', '1') == '1'
+
+# Tags every Chrome we launch with the launching process, so the watchdog can tell
+# our leftovers (from this or a crashed worker) apart from anyone else's Chrome
+OWNER_FLAG = '--scraper-owner-pid='
+# Processes younger than this may be a browser that is still being launched
+ORPHAN_GRACE_SECONDS = 60
+
+BROWSERS_REAPED = registry.counter(
+    'scraper_browsers_reaped_total', 'Chrome/chromedriver process trees killed by supervision.', ('reason',))
+
+_chromedriver_path = None
+_chromedriver_lock = threading.Lock()
+
+def chromedriver_path():
+    # Resolving the driver hits the network/cache, so only do it once per process; pool
+    # threads launching their first browsers together wait for the one resolution
+    global _chromedriver_path
+    if _chromedriver_path is None:
+        with _chromedriver_lock:
+            if _chromedriver_path is None:
+                with stage('driver_install'):
+                    _chromedriver_path = ChromeDriverManager().install()
+    return _chromedriver_path
+
+def chrome_options():
+    options = Options()
+    options.add_argument('--headless')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument(f'{OWNER_FLAG}{os.getpid()}')
+    if BROWSER_LITE_PROFILE:
+        # Roster pages are text: skip the bytes, decoding and memory for everything else
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        options.add_argument('--disable-remote-fonts')
+        options.add_argument('--disable-extensions')
+        options.add_argument('--disable-component-extensions-with-background-pages')
+        options.add_argument('--disable-background-networking')
+        options.add_argument('--disable-gpu')
+        options.add_argument('--mute-audio')
+        options.add_experimental_option('prefs', {
+            'profile.managed_default_content_settings.images': 2,
+            'profile.default_content_setting_values.notifications': 2,
+        })
+        # Return from driver.get at DOMContentLoaded; wait_until_ready waits for the roster itself
+        options.page_load_strategy = 'eager'
+    return options
+
+def launch_browser():
+    service = Service(chromedriver_path())
+    with stage('browser_launch'):
+        driver = webdriver.Chrome(service=service, options=chrome_options())
+    try:
+        driver.set_page_load_timeout(BROWSER_PAGE_LOAD_TIMEOUT)
+        driver.set_script_timeout(BROWSER_SCRIPT_TIMEOUT)
+    except Exception:
+        PooledBrowser(driver).quit()
+        raise
+    return driver
+
+def process_tree(pid):
+    # The process and all its descendants (chromedriver -> chrome -> renderers, ...)
+    try:
+        root = psutil.Process(pid)
+        return [root] + root.children(recursive=True)
+    except psutil.Error:
+        return []
+
+def kill_processes(processes, timeout=3):
+    for process in processes:
+        try:
+            process.terminate()
+        except psutil.Error:
+            pass
+    _, alive = psutil.wait_procs(processes, timeout=timeout)
+    for process in alive:
+        try:
+            process.kill()
+        except psutil.Error:
+            pass
+
+def tree_rss(processes):
+    total = 0
+    for process in processes:
+        try:
+            total += process.memory_info().rss
+        except psutil.Error:
+            pass
+    return total
+
+def owner_pid(cmdline):
+    for arg in cmdline or ():
+        if arg.startswith(OWNER_FLAG):
+            try:
+                return int(arg[len(OWNER_FLAG):])
+            except ValueError:
+                return None
+    return None
+
+def find_orphans(known_pids):
+    """Chrome/chromedriver processes we launched that no pooled browser owns:
+    untracked children of this process, or tagged browsers whose owner is gone."""
+    me = os.getpid()
+    cutoff = time.time() - ORPHAN_GRACE_SECONDS
+    orphans = []
+    for process in psutil.process_iter(['pid', 'ppid', 'name', 'cmdline', 'create_time']):
+        info = process.info
+        if info['pid'] in known_pids or 'chrome' not in (info['name'] or '').lower():
+            continue
+        if (info['create_time'] or 0) > cutoff:
+            continue
+        owner = owner_pid(info['cmdline'])
+        if info['ppid'] == me or owner == me or (owner is not None and not psutil.pid_exists(owner)):
+            orphans.append(process)
+    return orphans
+
+class PooledBrowser:
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        process = getattr(driver.service, 'process', None)
+        self.pid = process.pid if process is not None else None
+
+    def processes(self):
+        if psutil is None or self.pid is None:
+            return []
+        return process_tree(self.pid)
+
+    def rss_bytes(self):
+        return tree_rss(self.processes())
+
+    def kill(self):
+        # Hard stop without talking to chromedriver, e.g. when it is hung or over its memory limit
+        if psutil is not None:
+            kill_processes(self.processes())
+        else:
+            process = getattr(self.driver.service, 'process', None)
+            if process is not None and process.poll() is None:
+                process.kill()
+
+    def quit(self):
+        # Snapshot the tree first: Chrome is reparented away from chromedriver once it exits
+        processes = self.processes()
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+        if psutil is not None:
+            kill_processes([p for p in processes if p.is_running()])
+        else:
+            self.kill()
+
+class BrowserPool:
+    """A small pool of warm headless Chrome sessions.
+
+    Browsers are started lazily up to ``size`` and recycled after ``max_pages``
+    page loads, once over ``max_rss_mb``, or immediately if a page load raised
+    (the session may be dead). A watchdog thread kills browsers that blow past
+    the memory limit mid-page and reaps Chrome processes nobody owns any more.
+    """
+
+    def __init__(self, size=BROWSER_POOL_SIZE, max_pages=BROWSER_MAX_PAGES,
+                 max_rss_mb=BROWSER_MAX_RSS_MB, watchdog_interval=BROWSER_WATCHDOG_INTERVAL):
+        self.size = max(1, size)
+        self.max_pages = max(1, max_pages)
+        self.max_rss_bytes = max_rss_mb * 1024 * 1024 if psutil is not None else 0
+        self.watchdog_interval = watchdog_interval if psutil is not None else 0
+        self._idle = []
+        self._live = set()  # every launched browser, idle or checked out
+        self._active = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._watchdog = None
+        if psutil is None and (max_rss_mb or watchdog_interval):
+            logger.info('psutil not installed: browser RSS limits and orphan watchdog are disabled')
+
+    def checkout(self, timeout=BROWSER_CHECKOUT_TIMEOUT):
+        with self._cond:
+            if not self._cond.wait_for(
+                    lambda: self._closed or self._idle or self._active < self.size, timeout):
+                raise TimeoutError(f'No browser available after {timeout:g}s')
+            if self._closed:
+                raise RuntimeError('Browser pool is shut down')
+            if self._idle:
+                return self._idle.pop()
+            self._active += 1
+            self._start_watchdog()
+        # Launch outside the lock so other threads can check in meanwhile
+        try:
+            browser = PooledBrowser(launch_browser())
+        except Exception:
+            with self._cond:
+                self._active -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._live.add(browser)
+        return browser
+
+    def over_limit(self, browser):
+        if not self.max_rss_bytes:
+            return False
+        rss = browser.rss_bytes()
+        if rss > self.max_rss_bytes:
+            logger.warning('Browser pid %s using %.0f MB, recycling it', browser.pid, rss / 2 ** 20)
+            return True
+        return False
+
+    def checkin(self, browser, broken=False):
+        browser.pages += 1
+        if not broken and self.over_limit(browser):
+            BROWSERS_REAPED.inc(reason='rss')
+            broken = True
+        with self._cond:
+            keep = not (broken or self._closed or browser.pages >= self.max_pages)
+            if keep:
+                self._idle.append(browser)
+            else:
+                self._active -= 1
+                self._live.discard(browser)
+            self._cond.notify()
+        if not keep:
+            browser.quit()
+
+    @contextmanager
+    def session(self):
+        with stage('browser_checkout'):
+            browser = self.checkout()
+        try:
+            yield browser.driver
+        except BaseException:
+            # Crashed or in an unknown state (e.g. half-loaded page); don't reuse it
+            self.checkin(browser, broken=True)
+            raise
+        else:
+            self.checkin(browser)
+
+    def _start_watchdog(self):
+        # Called with the lock held, on the first launch
+        if self._watchdog is None and self.watchdog_interval > 0:
+            self._watchdog = threading.Thread(target=self._watch, name='browser-watchdog', daemon=True)
+            self._watchdog.start()
+
+    def _watch(self):
+        while True:
+            try:
+                self.supervise()
+            except Exception:
+                logger.exception('Browser watchdog pass failed')
+            if self._stop.wait(self.watchdog_interval):
+                return
+
+    def supervise(self):
+        """One watchdog pass: kill browsers over the memory limit and reap orphans."""
+        with self._cond:
+            live = list(self._live)
+        known_pids = set()
+        for browser in live:
+            processes = browser.processes()
+            if self.max_rss_bytes and tree_rss(processes) > self.max_rss_bytes:
+                logger.warning('Browser pid %s over %.0f MB, killing it', browser.pid, self.max_rss_bytes / 2 ** 20)
+                BROWSERS_REAPED.inc(reason='rss')
+                with self._cond:
+                    idle = browser in self._idle
+                    if idle:
+                        self._idle.remove(browser)
+                        self._live.discard(browser)
+                        self._active -= 1
+                        self._cond.notify()
+                if idle:
+                    browser.quit()
+                else:
+                    # The page call in progress fails and session() checks it in as broken
+                    browser.kill()
+                continue
+            known_pids.update(process.pid for process in processes)
+        orphans = find_orphans(known_pids)
+        for orphan in orphans:
+            logger.warning('Reaping orphaned %s (pid %s)', orphan.info['name'], orphan.pid)
+            kill_processes(process_tree(orphan.pid))
+        if orphans:
+            BROWSERS_REAPED.inc(len(orphans), reason='orphan')
+        return len(orphans)
+
+    def shutdown(self):
+        self._stop.set()
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._live.difference_update(idle)
+            self._active -= len(idle)
+            self._cond.notify_all()
+        for browser in idle:
+            browser.quit()
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool._closed:
+            _pool = BrowserPool()
+        return _pool
+
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown()
+
+# Scripts and cron runs exit without a lifespan shutdown; don't leave Chrome behind
+atexit.register(shutdown_pool)
@@ -0,0 +1,129 @@
+from collections import deque
+from .database import venue_entries
+from .results_store import results_store
+import threading
+import asyncio
+import json
+import uuid
+import os
+
+CHANGE_HISTORY = int(os.environ.get('CHANGE_HISTORY', '500'))
+
+def roster_index(venue_data):
+    # {(roster_date, name): shift} for one venue's scrape result
+    if not isinstance(venue_data, dict):
+        return {}
+    return {(roster_date, name): shift for roster_date, name, shift in venue_entries(venue_data)}
+
+def diff_venue(old_data, new_data):
+    """Entries added, removed or with a changed shift between two scrapes of a venue,
+    matched by roster date and name (so tomorrow's roster becoming today's is not a change)."""
+    old, new = roster_index(old_data), roster_index(new_data)
+    def entry(key, shift):
+        return {'date': key[0], 'name': key[1], 'shift': shift}
+    added = [entry(key, shift) for key, shift in new.items() if key not in old]
+    removed = [entry(key, shift) for key, shift in old.items() if key not in new]
+    changed = [dict(entry(key, shift), previous_shift=old[key])
+               for key, shift in new.items() if key in old and old[key] != shift]
+    if not (added or removed or changed):
+        return None
+    return {'added': added, 'removed': removed, 'changed': changed}
+
+def diff_results(old_results, new_results):
+    old_results = old_results or {}
+    venues = {}
+    for venue, data in new_results.items():
+        if isinstance(data, dict) and data.get('error'):
+            continue  # stale data kept after a failure is not a roster change
+        diff = diff_venue(old_results.get(venue), data)
+        if diff:
+            venues[venue] = diff
+    return venues
+
+class ChangeFeed:
+    """Versioned log of per-venue roster diffs between consecutive snapshots.
+
+    Fed by the results store whenever it sees new data (written here or by
+    another worker), and fanned out to SSE subscribers on their event loops.
+    """
+
+    def __init__(self, history=CHANGE_HISTORY):
+        # Versions restart with the process; feed_id lets clients notice and resync
+        self.feed_id = uuid.uuid4().hex[:12]
+        self.version = 0
+        self._changes = deque(maxlen=max(1, history))
+        self._last = None
+        self._primed = False
+        self._lock = threading.Lock()
+        self._subscribers = set()
+
+    def publish(self, results):
+        with self._lock:
+            if not self._primed:
+                # First snapshot seen by this process is the baseline, not a change
+                self._last, self._primed = results, True
+                return None
+            venues = diff_results(self._last, results)
+            self._last = results
+            if not venues:
+                return None
+            self.version += 1
+            change = {
+                'version': self.version,
+                'timestamp': max((results[v].get('changed_at') or results[v].get('timestamp') or '' for v in venues),
+                                 default=None),
+                'venues': venues,
+            }
+            self._changes.append(change)
+            subscribers = list(self._subscribers)
+        for loop, queue in subscribers:
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, change)
+            except RuntimeError:
+                pass  # subscriber's loop already closed
+        return change
+
+    def since(self, version):
+        """Changes after ``version``, or None if the client must refetch /results
+        (the version is from another process lifetime or fell out of the history)."""
+        with self._lock:
+            if version > self.version:
+                return None
+            if version == self.version:
+                return []
+            if not self._changes or self._changes[0]['version'] > version + 1:
+                return None
+            return [change for change in self._changes if change['version'] > version]
+
+    def event_id(self, version):
+        return f'{self.feed_id}:{version}'
+
+    def resume(self, event_id):
+        """Changes after a client's last event id (``<feed_id>:<version>``), or None
+        if it must refetch /results (malformed, or from another feed)."""
+        feed_id, _, version = (event_id or '').rpartition(':')
+        if feed_id != self.feed_id or not version.isdigit():
+            return None
+        return self.since(int(version))
+
+    def subscribe(self):
+        queue = asyncio.Queue()
+        subscriber = (asyncio.get_running_loop(), queue)
+        with self._lock:
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+change_feed = ChangeFeed()
+results_store.add_listener(change_feed.publish)
+
+def sse_event(event, data, event_id=None):
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'event: {event}')
+    lines.append('data: ' + json.dumps(data, ensure_ascii=False, separators=(',', ':')))
+    return '\n'.join(lines) + '\n\n'
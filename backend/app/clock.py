@@ -0,0 +1,29 @@
+import datetime
+
+def now_sydney_iso():
+    try:
+        import pytz
+        SYDNEY_TZ = pytz.timezone('Australia/Sydney')
+        return datetime.datetime.now(SYDNEY_TZ).isoformat()
+    except ImportError:
+        # Fallback to UTC if pytz is not available
+        return datetime.datetime.now().isoformat()
+
+def sydney_iso_from_timestamp(timestamp):
+    try:
+        import pytz
+        SYDNEY_TZ = pytz.timezone('Australia/Sydney')
+        return datetime.datetime.fromtimestamp(timestamp, SYDNEY_TZ).isoformat()
+    except ImportError:
+        return datetime.datetime.fromtimestamp(timestamp).isoformat()
+
+def sydney_time(moment=None):
+    # ``moment`` (default now) as Sydney wall-clock time; naive datetimes are taken as Sydney already
+    try:
+        import pytz
+        sydney = pytz.timezone('Australia/Sydney')
+    except ImportError:
+        return moment or datetime.datetime.now()
+    if moment is None:
+        return datetime.datetime.now(sydney)
+    return moment.astimezone(sydney) if moment.tzinfo else moment
@@ -1 +1,141 @@
-# Optional: Add database connection logic here
+import datetime
+import threading
+import logging
+import sqlite3
+import os
+
+from .normalize import TIME_RANGE_RE, collapse_spaces
+from .storage import data_path
+
+logger = logging.getLogger(__name__)
+
+ROSTER_DB = data_path(os.environ.get('ROSTER_DB', 'roster_history.db'))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS roster_entries (
+    venue TEXT NOT NULL,
+    roster_date TEXT NOT NULL,
+    name TEXT NOT NULL COLLATE NOCASE,
+    shift TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    PRIMARY KEY (venue, roster_date, name, shift)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_roster_entries_name_date ON roster_entries (name, roster_date);
+CREATE INDEX IF NOT EXISTS idx_roster_entries_date ON roster_entries (roster_date);
+"""
+
+UPSERT = """
+INSERT INTO roster_entries (venue, roster_date, name, shift, first_seen, last_seen)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (venue, roster_date, name, shift) DO UPDATE SET last_seen = excluded.last_seen
+"""
+
+def split_name_shift(text):
+    # "J Yumi 10.30am-12am" -> ("J Yumi", "10.30am-12am")
+    match = TIME_RANGE_RE.search(text)
+    if not match:
+        return None
+    name = collapse_spaces(text[:match.start()])
+    if not name:
+        return None
+    return name, f'{match.group(1)}-{match.group(2)}'
+
+def venue_entries(data, scraped_at=None):
+    """Yield (roster_date, name, shift) rows for one venue's scrape result.
+
+    The first roster is today's (in Sydney, on the day the page was read:
+    ``scraped_at``, else the result's ``timestamp``), the second tomorrow's,
+    and so on; this matches how the frontend reads them.
+    """
+    try:
+        read_at = scraped_at or data['timestamp']
+        today = datetime.datetime.fromisoformat(read_at).date()
+    except (KeyError, TypeError, ValueError):
+        return
+    if 'today' in data or 'tomorrow' in data:
+        days = [data.get('today') or [], data.get('tomorrow') or []]
+        for offset, rows in enumerate(days):
+            roster_date = (today + datetime.timedelta(days=offset)).isoformat()
+            for row in rows:
+                if row.get('name'):
+                    yield roster_date, row['name'].strip(), (row.get('time') or '').strip()
+    for offset, roster in enumerate(data.get('rosters') or []):
+        roster_date = (today + datetime.timedelta(days=offset)).isoformat()
+        for text in roster.get('names') or []:
+            parts = split_name_shift(text)
+            if parts:
+                yield (roster_date,) + parts
+
+class RosterHistory:
+    """Embedded SQLite (WAL) history of every roster entry seen per venue and day."""
+
+    def __init__(self, path=ROSTER_DB):
+        self.path = path
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialised = False
+        self._connections = []
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # One connection per thread; check_same_thread is off only so close() can run at shutdown
+            conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            with self._init_lock:
+                if not self._initialised:
+                    conn.executescript(SCHEMA)
+                    self._initialised = True
+                self._connections.append(conn)
+            self._local.conn = conn
+        return conn
+
+    def record(self, results, scraped_at=None):
+        """Upsert every entry from a scrape result ({venue: data}) in one transaction."""
+        rows = []
+        for venue, data in results.items():
+            if not isinstance(data, dict) or data.get('error'):
+                continue
+            seen = scraped_at or data.get('timestamp')
+            for roster_date, name, shift in venue_entries(data, seen):
+                rows.append((venue, roster_date, name, shift, seen, seen))
+        if not rows:
+            return 0
+        conn = self._connect()
+        with conn:
+            conn.executemany(UPSERT, rows)
+        return len(rows)
+
+    def roster(self, venue, roster_date):
+        rows = self._connect().execute(
+            'SELECT name, shift, first_seen, last_seen FROM roster_entries '
+            'WHERE venue = ? AND roster_date = ? ORDER BY name',
+            (venue, roster_date)).fetchall()
+        return [dict(row) for row in rows]
+
+    def last_seen(self, name):
+        row = self._connect().execute(
+            'SELECT venue, roster_date, name, shift, last_seen FROM roster_entries '
+            'WHERE name = ? ORDER BY roster_date DESC LIMIT 1',
+            (name.strip(),)).fetchone()
+        return dict(row) if row else None
+
+    def close(self):
+        with self._init_lock:
+            connections, self._connections = self._connections, []
+            self._local = threading.local()
+        for conn in connections:
+            conn.close()
+
+roster_history = RosterHistory()
+
+def record_history(results, scraped_at=None):
+    # History is best-effort: a database problem must never fail a scrape
+    try:
+        return roster_history.record(results, scraped_at)
+    except sqlite3.Error as exc:
+        logger.warning('Could not record roster history: %s', exc)
+        return 0
@@ -0,0 +1,251 @@
+from .normalize import (
+    normalize_names, collapse_spaces, WHITESPACE_RE, BADGES_RE, GINZA_DIRECT_ENTRY_RE,
+    SPLIT_AM_DASH_RE, SPLIT_PM_DASH_RE, SPACED_RANGE_RE, NAME_PREFIX_RE, SPAN_SPLIT_AM_RE,
+    SPAN_SPACED_DASH_RE, NAME_WITH_PHOTO_RE, PHOTO_RE, TIME_NOISE_RE, SPLIT_DECIMAL_RE,
+    COMPACT_RANGE_RE, GINZA479_ENTRY_RE,
+)
+from .metrics import stage, count_entries
+
+# Extraction strategies: parse(soup, venue) -> roster dict. A venue picks one by name
+# in its declaration (see venues.py); the venue supplies the title, block title and
+# normalization rules, so several sites with the same markup share one strategy.
+
+def parse_no5_roster(soup, venue):
+    def extract_roster_from_timetable(soup, roster_id):
+        container = soup.find('div', id=roster_id)
+        roster = []
+        if container:
+            timetable = container.find('div', class_='timetable')
+            if timetable:
+                rows = timetable.find_all('div', class_='timetable__row')
+                for row in rows:
+                    name_elem = row.find('p', class_='timetable__name')
+                    time_elem = row.find('p', class_='timetable__time')
+                    name = name_elem.get_text(strip=True) if name_elem else None
+                    time_ = time_elem.get_text(strip=True) if time_elem else None
+                    if name or time_:
+                        roster.append({'name': name, 'time': time_})
+                count_entries(parsed=len(roster), dropped=len(rows) - len(roster))
+        return roster
+    today = extract_roster_from_timetable(soup, 'nav-rostertoday')
+    tomorrow = extract_roster_from_timetable(soup, 'nav-rostertomorrow')
+    return {
+        'title': venue.title,
+        'today': today,
+        'tomorrow': tomorrow
+    }
+
+def parse_ginza_roster(soup, venue):
+    # Find all roster blocks
+    roster_blocks = soup.find_all('div', class_='clearfix', style=lambda v: v and 'margin-bottom: 20px' in v)
+    results = []
+    for block in roster_blocks:
+        # Try to extract a date/title if present
+        title = None
+        strongs = block.find_all('strong')
+        for s in strongs:
+            if s.text.strip():
+                title = s.text.strip()
+                break
+        names = []
+        # Only extract from <div class='info'> inside the block
+        info_div = block.find('div', class_='info')
+        if info_div:
+            # For each <p>, try multiple extraction approaches
+            for p in info_div.find_all('p'):
+                spans = p.find_all('span')
+                
+                # Get direct text from <p> first (often has the clean version)
+                p_direct_text = p.get_text(" ", strip=True)
+                
+                # Check if p direct text contains a complete roster entry and use it directly
+                # More flexible pattern to catch cases like "J Yumi 10.30a m -12am"
+                if GINZA_DIRECT_ENTRY_RE.search(p_direct_text):
+                    # Clean up the direct text and use it
+                    cleaned = BADGES_RE.sub('', p_direct_text)
+                    cleaned = collapse_spaces(cleaned)
+                    
+                    # Fix specific time formatting issues in the direct text
+                    # "10.30a m -12am" -> "10.30am-12am"
+                    cleaned = SPLIT_AM_DASH_RE.sub(r'\1am-', cleaned)
+                    cleaned = SPLIT_PM_DASH_RE.sub(r'\1pm-', cleaned)
+                    # Remove extra spaces between time components and normalize spacing
+                    cleaned = SPACED_RANGE_RE.sub(r'\1-\2', cleaned)
+                    
+                    names.append(cleaned)
+                    continue  # Skip span-based extraction for this <p>
+                
+                # If spans exist, work with them but be more careful about duplicates
+                if spans:
+                    # Get unique span texts (avoid processing identical spans)
+                    unique_span_texts = []
+                    seen_texts = set()
+                    
+                    for span in spans:
+                        span_text = span.get_text(" ", strip=True)
+                        if span_text and span_text not in seen_texts:
+                            unique_span_texts.append(span_text)
+                            seen_texts.add(span_text)
+                    
+                    # Try to find the best combination from unique spans
+                    if len(unique_span_texts) >= 2:
+                        # Look for a name + time combination
+                        for i, first_span in enumerate(unique_span_texts):
+                            # Skip if this looks like metadata
+                            if any(x in first_span.lower() for x in ['photo', 'diamond', 'class', 'korean', 'indian']):
+                                continue
+                            
+                            # Check if this could be a name
+                            if NAME_PREFIX_RE.match(first_span):
+                                # Look for time in remaining spans
+                                for j, second_span in enumerate(unique_span_texts[i+1:], i+1):
+                                    if ('am' in second_span or 'pm' in second_span) and '-' in second_span:
+                                        combined = f"{first_span} {second_span}"
+                                        # Apply time fixes
+                                        combined = SPAN_SPLIT_AM_RE.sub(r'\1\2', combined)
+                                        combined = SPAN_SPACED_DASH_RE.sub(r'\1\2', combined)
+                                        names.append(combined.strip())
+                                        break
+                                break
+                    
+                    # If no combination found, try reconstructing from fragments
+                    if not names or not any(unique_span_texts[0] in name for name in names):
+                        full_text = " ".join(unique_span_texts)
+                        
+                        # Look for name pattern
+                        name_match = NAME_WITH_PHOTO_RE.match(full_text)
+                        if name_match:
+                            name_part = name_match.group(1)
+                            name_part = PHOTO_RE.sub(' ', name_part).strip()
+                            
+                            # Get time components
+                            time_components = full_text[len(name_match.group(1)):].strip()
+                            time_clean = TIME_NOISE_RE.sub('', time_components)
+                            time_clean = collapse_spaces(time_clean)
+                            
+                            # Try to reconstruct time
+                            time_reconstructed = time_clean
+                            time_reconstructed = SPLIT_AM_DASH_RE.sub(r'\1am-', time_reconstructed)
+                            time_reconstructed = SPLIT_PM_DASH_RE.sub(r'\1pm-', time_reconstructed)
+                            time_reconstructed = SPLIT_DECIMAL_RE.sub(r'\1\2\3', time_reconstructed)
+                            time_reconstructed = WHITESPACE_RE.sub('', time_reconstructed)
+                            
+                            # Check for valid time pattern
+                            if COMPACT_RANGE_RE.search(time_reconstructed):
+                                combined = f"{name_part} {time_reconstructed}"
+                                names.append(combined.strip())
+                
+                elif not spans:
+                    # fallback: treat the whole <p> as before
+                    txt = p.get_text(" ", strip=True)
+                    if ("am" in txt or "pm" in txt or "-" in txt):
+                        names.append(txt)
+            # Also check for <span> tags not inside <p> (if any)
+            for tag in info_div.find_all('span'):
+                if tag.parent.name != 'p':
+                    txt = tag.get_text(" ", strip=True)
+                    # Only add if not already present in names
+                    if ("am" in txt or "pm" in txt or "-" in txt) and all(txt not in n for n in names):
+                        names.append(txt)
+        with stage('normalize'):
+            final_names = normalize_names(names, venue.rules)
+        count_entries(parsed=len(final_names), dropped=len(names) - len(final_names))
+        results.append({
+            'title': title or venue.block_title,
+            'names': final_names
+        })
+    # Don't merge rosters - keep them separate for today/tomorrow
+    return {
+        'title': venue.title,
+        'rosters': results  # Keep all separate roster blocks
+    }
+
+def parse_479ginza_roster(soup, venue):
+    roster_blocks = soup.find_all('div', class_='clearfix', style=lambda v: v and 'margin-bottom: 20px' in v)
+    results = []
+    for block in roster_blocks:
+        title = None
+        strongs = block.find_all('strong')
+        for s in strongs:
+            if s.text.strip():
+                title = s.text.strip()
+                break
+        names = []
+        
+        # Look for entries in both <div class='info'> and direct child divs
+        info_div = block.find('div', class_='info')
+        divs_to_check = [info_div] if info_div else []
+        
+        # Also check direct child divs that might not have the 'info' class
+        for child_div in block.find_all('div', recursive=False):
+            if child_div not in divs_to_check:
+                divs_to_check.append(child_div)
+        
+        for div_to_process in divs_to_check:
+            if div_to_process:
+                # Get all text from each <p> tag and look for roster entries
+                for p in div_to_process.find_all('p'):
+                    full_text = p.get_text(" ", strip=True)
+                    
+                    # Look for patterns like "V Fiona 1pm-4am" or "J Kitty 12pm-4am" in the text
+                    # Captures name + time range, but NOT the "Diamond Class" suffix
+                    matches = GINZA479_ENTRY_RE.findall(full_text)
+                    
+                    for match in matches:
+                        # Clean up the match
+                        cleaned_match = WHITESPACE_RE.sub(' ', match.strip())
+                        names.append(cleaned_match)
+                    
+                    # Also extract from individual spans that contain roster entries
+                    spans = p.find_all('span')
+                    for span in spans:
+                        span_text = span.get_text(" ", strip=True)
+                        # Look for roster entries within spans - more flexible pattern
+                        if GINZA479_ENTRY_RE.search(span_text):
+                            # Clean up and add the span text
+                            cleaned_span = WHITESPACE_RE.sub(' ', span_text.strip())
+                            names.append(cleaned_span)
+                    
+                    # Original span-based approach for compatibility
+                    name_part = None
+                    time_part = None
+                    for span in spans:
+                        txt = span.get_text(" ", strip=True)
+                        if not name_part and txt and not txt.startswith('New') and len(txt) > 3:
+                            name_part = txt
+                            continue
+                        if name_part and not time_part and txt and ('am' in txt or 'pm' in txt):
+                            time_part = txt
+                            break
+                    if name_part and time_part:
+                        combined = f"{name_part} {time_part}"
+                        names.append(combined.strip())
+                    elif not spans:
+                        # fallback: treat the whole <p> as before
+                        if ("am" in full_text or "pm" in full_text) and "-" in full_text:
+                            names.append(full_text)
+                
+                # Also check for <span> tags not inside <p> (if any)
+                for tag in div_to_process.find_all('span'):
+                    if tag.parent.name != 'p':
+                        txt = tag.get_text(" ", strip=True)
+                        # Only add if not already present in names
+                        if ("am" in txt or "pm" in txt or "-" in txt) and all(txt not in n for n in names):
+                            names.append(txt)
+        with stage('normalize'):
+            final_names = normalize_names(names, venue.rules)
+        count_entries(parsed=len(final_names), dropped=len(names) - len(final_names))
+        results.append({
+            'title': title or venue.block_title,
+            'names': final_names
+        })
+    return {
+        'title': venue.title,
+        'rosters': results
+    }
+
+EXTRACTORS = {
+    'timetable': parse_no5_roster,
+    'ginza-blocks': parse_ginza_roster,
+    'ginza479-blocks': parse_479ginza_roster,
+}
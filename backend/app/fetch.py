@@ -0,0 +1,64 @@
+from requests.adapters import HTTPAdapter
+import requests
+import threading
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+HTTP_TIMEOUT = float(os.environ.get('HTTP_TIMEOUT', '10'))
+HTTP_USER_AGENT = os.environ.get(
+    'HTTP_USER_AGENT',
+    'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36')
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session():
+    # One keep-alive session per process, shared by the scrape worker threads
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8, max_retries=1)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers.update({'User-Agent': HTTP_USER_AGENT})
+            _session = session
+        return _session
+
+def get_http_html(url, validators=None):
+    """Fetch ``url`` with a plain GET, conditionally if ``validators`` (the
+    ETag/Last-Modified from a previous fetch) are given.
+
+    Returns ``(html, validators)``:
+    ``(html, {...})`` on success,
+    ``(None, validators)`` if the server answered 304 Not Modified, and
+    ``(None, None)`` if the request failed.
+    """
+    headers = {}
+    if validators:
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+    try:
+        response = get_session().get(url, headers=headers, timeout=HTTP_TIMEOUT)
+        if response.status_code == 304 and validators:
+            return None, validators
+        response.raise_for_status()
+    except requests.RequestException as exc:
+        logger.info('HTTP fetch of %s failed: %s', url, exc)
+        return None, None
+    new_validators = {
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+    }
+    return response.text, new_validators
+
+def close_session():
+    global _session
+    with _session_lock:
+        session, _session = _session, None
+    if session is not None:
+        session.close()
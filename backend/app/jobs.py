@@ -0,0 +1,113 @@
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from .venues import VENUES
+from .clock import now_sydney_iso
+import threading
+import uuid
+import os
+
+# How many scrapes may run at once, and how many finished jobs to remember
+SCRAPE_JOB_WORKERS = int(os.environ.get('SCRAPE_JOB_WORKERS', '1'))
+SCRAPE_JOB_HISTORY = int(os.environ.get('SCRAPE_JOB_HISTORY', '20'))
+
+class ScrapeJob:
+    def __init__(self, venue=None):
+        self.id = uuid.uuid4().hex
+        self.venue = venue  # None = every registered venue
+        self.status = 'queued'
+        self.venues = {key: 'pending' for key in ([venue] if venue else VENUES)}
+        self.created_at = now_sydney_iso()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.error = None
+        self.future = None
+
+    @property
+    def done(self):
+        return self.status in ('succeeded', 'failed')
+
+    def set_venue_status(self, key, state):
+        self.venues[key] = state
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'venue': self.venue,
+            'status': self.status,
+            'venues': dict(self.venues),
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'error': self.error,
+        }
+
+class JobManager:
+    """Runs scrapes in a bounded background executor with single-flight dedup:
+    while a scrape of the same target (all venues, or one venue) is queued or
+    running, new requests attach to it."""
+
+    def __init__(self, max_workers=SCRAPE_JOB_WORKERS, history=SCRAPE_JOB_HISTORY):
+        self.history = max(1, history)
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix='scrape-job')
+        self._jobs = OrderedDict()
+        self._current = {}  # None (all venues) or venue key -> latest job
+        self._latest = None
+        self._lock = threading.Lock()
+
+    def submit(self, venue=None):
+        """Return ``(job, created)``; ``created`` is False when attaching to a running job."""
+        if venue is not None and venue not in VENUES:
+            raise KeyError(venue)
+        with self._lock:
+            current = self._current.get(venue)
+            if current is not None and not current.done:
+                return current, False
+            job = ScrapeJob(venue)
+            self._jobs[job.id] = job
+            while len(self._jobs) > self.history:
+                self._jobs.popitem(last=False)
+            self._current[venue] = job
+            self._latest = job
+            job.future = self._executor.submit(self._run, job)
+            return job, True
+
+    def _run(self, job):
+        # Imported here so processes that only serve results never load selenium/bs4
+        from .scraper import scrape_data, scrape_venue
+        job.status = 'running'
+        job.started_at = now_sydney_iso()
+        try:
+            if job.venue is None:
+                job.result = scrape_data(progress=job.set_venue_status)
+            else:
+                job.set_venue_status(job.venue, 'running')
+                job.result = scrape_venue(job.venue)
+                job.set_venue_status(job.venue, 'done')
+            job.status = 'succeeded'
+        except Exception as exc:
+            job.error = f'{type(exc).__name__}: {exc}'
+            job.status = 'failed'
+            raise
+        finally:
+            job.finished_at = now_sydney_iso()
+        return job.result
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def current(self):
+        with self._lock:
+            return self._latest
+
+    def busy(self, venue):
+        """True while a full scrape, or a job for ``venue``, is queued or running."""
+        with self._lock:
+            jobs = (self._current.get(None), self._current.get(venue))
+            return any(job is not None and not job.done for job in jobs)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+job_manager = JobManager()
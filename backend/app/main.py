@@ -1,8 +1,44 @@
-from fastapi import FastAPI
-from .scraper import scrape_data, load_latest_results
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from .jobs import job_manager
+from .results_store import results_store
+from .database import roster_history
+from .changes import change_feed, sse_event
+from .shifts import shift_index, parse_clock, DAY_MINUTES
+from .clock import sydney_time
+from .scheduler import create_scheduler, SCRAPE_SCHEDULER
+from .metrics import registry, HTTP_REQUESTS, HTTP_REQUEST_SECONDS
 from fastapi.middleware.cors import CORSMiddleware
+from contextlib import asynccontextmanager
+import asyncio
+import datetime
+import time
+import sys
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app):
+    # Load the current snapshot now; it is also the baseline for the change feed
+    results_store.get()
+    scheduler = None
+    if SCRAPE_SCHEDULER:
+        scheduler = create_scheduler()
+        scheduler.start()
+    app.state.scheduler = scheduler
+    yield
+    if scheduler is not None:
+        await scheduler.stop()
+    job_manager.shutdown()
+    # The scraping stack is imported on first scrape; only tear down what this worker loaded.
+    # Close any warm Chrome sessions so they don't outlive the worker.
+    browser_pool = sys.modules.get(f"{__package__}.browser_pool")
+    if browser_pool is not None:
+        browser_pool.shutdown_pool()
+    fetch = sys.modules.get(f"{__package__}.fetch")
+    if fetch is not None:
+        fetch.close_session()
+    roster_history.close()
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -12,13 +48,168 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        # Label by route template, not raw path, so /scrape/jobs/{job_id} stays one series
+        route = request.scope.get("route")
+        path = route.path if route is not None else "unmatched"
+        HTTP_REQUESTS.inc(method=request.method, route=path, status=status)
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, method=request.method, route=path)
+
+@app.get("/metrics")
+def get_metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
 @app.get("/scrape")
-def get_scraped_data():
-    return scrape_data()
+async def get_scraped_data():
+    # Waits for the (possibly already running) scrape job without holding a threadpool worker
+    job, _ = job_manager.submit()
+    return await asyncio.wrap_future(job.future)
+
+@app.post("/scrape/jobs", status_code=202)
+def start_scrape_job():
+    job, created = job_manager.submit()
+    return {**job.to_dict(), "created": created}
+
+@app.get("/scrape/jobs/current")
+def get_current_scrape_job():
+    job = job_manager.current()
+    if job is None:
+        raise HTTPException(status_code=404, detail="No scrape job has run yet.")
+    return job.to_dict()
+
+@app.get("/scrape/jobs/{job_id}")
+def get_scrape_job(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job id.")
+    return job.to_dict()
+
+@app.get("/scrape/jobs/{job_id}/result")
+def get_scrape_job_result(job_id: str):
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job id.")
+    if job.status == "failed":
+        raise HTTPException(status_code=500, detail=job.error)
+    if not job.done:
+        return JSONResponse(status_code=202, content=job.to_dict())
+    return job.result
+
+@app.get("/scrape/{venue}")
+async def scrape_single_venue(venue: str):
+    # Scrape just this venue (or join its running scrape) and merge it into the latest results
+    try:
+        job, _ = job_manager.submit(venue)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Unknown venue.")
+    try:
+        return await asyncio.wrap_future(job.future)
+    except Exception:
+        # Already recorded on the job; report it the way /scrape/jobs/{id}/result does
+        raise HTTPException(status_code=500, detail=job.error)
+
+@app.get("/scheduler")
+def get_scheduler_status(request: Request):
+    scheduler = request.app.state.scheduler
+    if scheduler is None:
+        return {"enabled": False, "venues": []}
+    return {"enabled": True, "venues": scheduler.status()}
+
+@app.get("/history/venues/{venue}")
+def get_venue_history(venue: str, date: datetime.date):
+    return {"venue": venue, "date": date.isoformat(), "entries": roster_history.roster(venue, date.isoformat())}
+
+@app.get("/history/names/{name}/last-seen")
+def get_name_last_seen(name: str):
+    entry = roster_history.last_seen(name)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Name not found in roster history.")
+    return entry
+
+@app.get("/results/changes")
+def get_result_changes(since: int = 0, feed_id: str = None):
+    results_store.get()  # pick up snapshots written by other worker processes
+    changes = change_feed.since(since) if feed_id in (None, change_feed.feed_id) else None
+    body = {"feed_id": change_feed.feed_id, "version": change_feed.version}
+    if changes is None:
+        # Unknown feed or version: the client should refetch /results and continue from here
+        return {**body, "reset": True, "changes": []}
+    return {**body, "reset": False, "changes": changes}
+
+@app.get("/results/stream")
+async def stream_result_changes(request: Request, since: str = None):
+    # Resume from "<feed_id>:<version>"; an id from another feed (e.g. before a restart) gets a reset
+    resume_from = since or request.headers.get("last-event-id")
+
+    async def events():
+        subscriber = change_feed.subscribe()
+        queue = subscriber[1]
+        sent = change_feed.version
+        try:
+            yield sse_event("hello", {"feed_id": change_feed.feed_id, "version": sent}, change_feed.event_id(sent))
+            if resume_from:
+                backlog = change_feed.resume(resume_from)
+                if backlog is None:
+                    yield sse_event("reset", {"feed_id": change_feed.feed_id, "version": sent})
+                for change in backlog or []:
+                    yield sse_event("changes", change, change_feed.event_id(change["version"]))
+                    sent = max(sent, change["version"])
+            while not await request.is_disconnected():
+                try:
+                    change = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    # Keep proxies from closing the idle stream, and notice other workers' writes
+                    await asyncio.to_thread(results_store.get)
+                    yield ": keepalive\n\n"
+                    continue
+                if change["version"] > sent:  # may already have gone out with the backlog
+                    sent = change["version"]
+                    yield sse_event("changes", change, change_feed.event_id(sent))
+        finally:
+            change_feed.unsubscribe(subscriber)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.get("/results/on-now")
+def get_on_now(venue: str = None, at: datetime.datetime = None):
+    # Who is rostered right now (or at ``at``), including overnight shifts from yesterday's roster
+    results_store.get()  # pick up snapshots written by other worker processes
+    moment = sydney_time(at)
+    return {"at": moment.isoformat(), "entries": shift_index.on_at(moment, venue)}
+
+@app.get("/results/shifts")
+def get_shifts(date: datetime.date = None, from_: str = Query(None, alias="from"), to: str = None,
+               venue: str = None):
+    # Shifts overlapping from-to (e.g. 6pm-2am, or 18:00-02:00) on a roster day, default today
+    try:
+        lo = parse_clock(from_) if from_ else 0
+        hi = parse_clock(to) if to else DAY_MINUTES
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    if hi <= lo:
+        hi += DAY_MINUTES
+    results_store.get()
+    roster_date = (date or sydney_time().date()).isoformat()
+    return {"date": roster_date, "from": lo, "to": hi, "entries": shift_index.between(roster_date, lo, hi, venue)}
 
 @app.get("/results")
-def get_latest_results():
-    data = load_latest_results()
-    if data is None:
+def get_latest_results(request: Request):
+    snapshot = results_store.get()
+    if snapshot is None:
         return {"error": "No results available yet."}
-    return data
+    headers = {"ETag": snapshot.etag, "Vary": "Accept-Encoding", "Cache-Control": "no-cache"}
+    if snapshot.matches(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        return Response(content=snapshot.gzip_body, media_type="application/json", headers=headers)
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
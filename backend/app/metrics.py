@@ -0,0 +1,232 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from .storage import data_path
+import threading
+import logging
+import bisect
+import time
+import json
+import os
+
+logger = logging.getLogger(__name__)
+
+# Append one JSON line per scrape run to this file (relative to SCRAPER_DATA_DIR); empty = off
+SCRAPE_RUN_LOG = os.environ.get('SCRAPE_RUN_LOG', '')
+
+# Seconds; covers both sub-millisecond parses and slow browser renders
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def format_labels(names, values, extra=()):
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{escape_label(value)}"' for name, value in pairs) + '}'
+
+def format_value(value):
+    if isinstance(value, int):
+        return str(value)
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value))
+
+class Metric:
+    """A labelled metric family in the Prometheus text exposition format.
+
+    Metrics are per process: with several uvicorn workers each one reports its
+    own, and Prometheus sums them across scrape targets.
+    """
+
+    kind = None
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} {self.kind}']
+        with self._lock:
+            items = sorted(self._values.items())
+            lines.extend(self._render_series(key, value) for key, value in items)
+        return '\n'.join(lines)
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def _render_series(self, key, value):
+        return f'{self.name}{format_labels(self.labelnames, key)} {format_value(value)}'
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                # Per-bucket (non-cumulative) counts, then sum and count
+                series = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def _render_series(self, key, series):
+        counts, total, count = series
+        lines, cumulative = [], 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            labels = format_labels(self.labelnames, key, [('le', format_value(bound))])
+            lines.append(f'{self.name}_bucket{labels} {cumulative}')
+        lines.append(f'{self.name}_bucket{format_labels(self.labelnames, key, [("le", "+Inf")])} {count}')
+        lines.append(f'{self.name}_sum{format_labels(self.labelnames, key)} {format_value(total)}')
+        lines.append(f'{self.name}_count{format_labels(self.labelnames, key)} {count}')
+        return '\n'.join(lines)
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, help_text, labelnames=()):
+        return self.register(Counter(name, help_text, labelnames))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, help_text, labelnames, buckets))
+
+    def render(self):
+        return '\n'.join(metric.render() for metric in self._metrics) + '\n'
+
+registry = Registry()
+
+SCRAPE_STAGE_SECONDS = registry.histogram(
+    'scraper_stage_duration_seconds', 'Time spent in each scrape stage (stages may nest).', ('venue', 'stage'))
+SCRAPE_VENUE_SECONDS = registry.histogram(
+    'scraper_venue_duration_seconds', 'Total time to scrape one venue.', ('venue',))
+SCRAPE_VENUE_RUNS = registry.counter(
+    'scraper_venue_scrapes_total', 'Venue scrapes by outcome (refreshed, reused or failed).', ('venue', 'status'))
+ENTRIES_PARSED = registry.counter(
+    'scraper_entries_parsed_total', 'Roster entries kept after extraction.', ('venue',))
+ENTRIES_DROPPED = registry.counter(
+    'scraper_entries_dropped_total', 'Raw roster entries dropped as duplicates or noise.', ('venue',))
+HTTP_REQUESTS = registry.counter(
+    'http_requests_total', 'API requests by route and status code.', ('method', 'route', 'status'))
+HTTP_REQUEST_SECONDS = registry.histogram(
+    'http_request_duration_seconds', 'API request latency until the response starts.', ('method', 'route'))
+
+class ScrapeRun:
+    """Stage timings and entry counts for one venue scrape, kept in a context
+    variable so code deep in the fetch/parse path can report without threading
+    the run through every call."""
+
+    def __init__(self, venue):
+        self.venue = venue
+        self.started = time.perf_counter()
+        self.seconds = None
+        self.stages = {}
+        self.parsed = 0
+        self.dropped = 0
+        self.status = None
+        self.source = None
+        self.error = None
+
+    def add_stage(self, stage, seconds):
+        self.stages[stage] = self.stages.get(stage, 0) + seconds
+        SCRAPE_STAGE_SECONDS.observe(seconds, venue=self.venue, stage=stage)
+
+    def finish(self):
+        self.seconds = time.perf_counter() - self.started
+        SCRAPE_VENUE_SECONDS.observe(self.seconds, venue=self.venue)
+        SCRAPE_VENUE_RUNS.inc(venue=self.venue, status=self.status or 'failed')
+        if self.parsed:
+            ENTRIES_PARSED.inc(self.parsed, venue=self.venue)
+        if self.dropped:
+            ENTRIES_DROPPED.inc(self.dropped, venue=self.venue)
+
+    def to_dict(self):
+        return {
+            'status': self.status or 'failed',
+            'source': self.source,
+            'seconds': round(self.seconds, 4) if self.seconds is not None else None,
+            'stages': {stage: round(seconds, 4) for stage, seconds in self.stages.items()},
+            'entries_parsed': self.parsed,
+            'entries_dropped': self.dropped,
+            'error': self.error,
+        }
+
+_current_run = ContextVar('scrape_run', default=None)
+# Most recent finished run per venue, for the per-scrape JSON log
+last_runs = {}
+
+@contextmanager
+def venue_run(venue):
+    run = ScrapeRun(venue)
+    token = _current_run.set(run)
+    try:
+        yield run
+    except Exception as exc:
+        run.status = 'failed'
+        run.error = f'{type(exc).__name__}: {exc}'
+        raise
+    finally:
+        _current_run.reset(token)
+        run.finish()
+        last_runs[venue] = run.to_dict()
+
+@contextmanager
+def stage(name, venue=None):
+    # Time a block as a stage of the current venue run (or of ``venue`` outside one)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - started
+        run = _current_run.get()
+        if run is not None:
+            run.add_stage(name, seconds)
+        elif venue is not None:
+            SCRAPE_STAGE_SECONDS.observe(seconds, venue=venue, stage=name)
+
+def count_entries(parsed=0, dropped=0):
+    run = _current_run.get()
+    if run is not None:
+        run.parsed += parsed
+        run.dropped += dropped
+
+def log_scrape_run(started_at, seconds, venues, errors=None):
+    """Append one JSON line describing a scrape (all venues or one) to SCRAPE_RUN_LOG."""
+    if not SCRAPE_RUN_LOG:
+        return
+    errors = errors or {}
+    record = {
+        'started_at': started_at,
+        'seconds': round(seconds, 4),
+        'venues': {key: ({'status': 'failed', 'error': errors[key]} if key in errors else last_runs.get(key))
+                   for key in venues},
+    }
+    try:
+        with open(data_path(SCRAPE_RUN_LOG), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n')
+    except OSError as exc:
+        logger.warning('Could not write scrape run log: %s', exc)
@@ -0,0 +1,110 @@
+from collections import namedtuple
+import re
+
+# Roster entry cleanup shared by the Ginza extractors. Patterns are compiled once
+# here instead of being re-parsed by re.sub/re.search on every entry.
+
+RosterEntry = namedtuple('RosterEntry', ['name', 'start', 'end'])
+
+I = re.IGNORECASE
+
+WHITESPACE_RE = re.compile(r'\s+')
+NEW_RE = re.compile(r'\bNew\b', I)
+DIAMOND_CLASS_RE = re.compile(r'\bDiamond\s+Class\b', I)
+BADGES_RE = re.compile(r'\(PHOTO\)|\bDiamond\s+Class\b|\bNew\b', I)
+NO_NATIONALITY_RE = re.compile(r'\(No Indian\)|\(No Korean\)', I)
+# "10am-2pm", "10.30am - 2am", "10:30 am-6pm", ...
+TIME_RANGE_RE = re.compile(r'(\d{1,2}(?:[:\.]\d{2})? ?[ap]m)\s*-\s*(\d{1,2}(?:[:\.]\d{2})? ?[ap]m)', I)
+NAME_TIME_RE = re.compile(r'([A-Z][^0-9]*?)' + TIME_RANGE_RE.pattern, I)
+
+# Patterns used while collecting raw entries from the Ginza (Cleveland) page markup
+GINZA_DIRECT_ENTRY_RE = re.compile(
+    r'[A-Z]\s+\w+\s+\d{1,2}(?:[:\.]\d{2})?\s*[ap]?\s*m?\s*-\s*\d{1,2}(?:[:\.]\d{2})?\s*[ap]m', I)
+SPLIT_AM_DASH_RE = re.compile(r'(\d+\.?\d*)a\s+m\s*-')       # "10.30a m -12am" -> "10.30am-12am"
+SPLIT_PM_DASH_RE = re.compile(r'(\d+\.?\d*)p\s+m\s*-')
+SPACED_RANGE_RE = re.compile(r'(\d+\.?\d*[ap]m)\s*-\s*(\d+\.?\d*[ap]m)')
+NAME_PREFIX_RE = re.compile(r'[A-Z]\s+\w+', I)
+SPAN_SPLIT_AM_RE = re.compile(r'(\d+\.?\d*a)\s+(m-\d+\.?\d*(?:am|pm))', I)
+SPAN_SPACED_DASH_RE = re.compile(r'(\d+\.?\d*(?:am|pm))\s+(-\d+\.?\d*(?:am|pm))', I)
+NAME_WITH_PHOTO_RE = re.compile(r'([A-Z]\s+\w+(?:\s+\(PHOTO\))?)', I)
+PHOTO_RE = re.compile(r'\s*\(PHOTO\)\s*')
+TIME_NOISE_RE = re.compile(r'\(PHOTO\)|\(No Korean[^)]*\)|\bDiamond\s+Class\b|\bNew\b', I)
+SPLIT_DECIMAL_RE = re.compile(r'(\d+)\s+(\.\d+[ap]m-\d+)\s+(\d+[ap]m)')
+COMPACT_RANGE_RE = re.compile(r'\d+\.?\d*[ap]m-\d+\.?\d*[ap]m', I)
+
+# Patterns used while collecting raw entries from the 479 Ginza (Elizabeth) page markup
+GINZA479_ENTRY_RE = re.compile(r'([A-Z]\w*\s+\w+\s+\d{1,2}(?::\d{2})?(?:am|pm)\s*-\s*\d{1,2}(?::\d{2})?(?:am|pm))', I)
+
+# Per-venue rule tables: what to strip from names and whether to drop repeated entries
+VENUE_RULES = {
+    'ginza': {
+        'name_noise': (BADGES_RE,),
+        'dedupe': True,
+    },
+    'ginza479': {
+        'name_noise': (BADGES_RE, NO_NATIONALITY_RE),
+        'dedupe': False,
+    },
+}
+
+def collapse_spaces(s):
+    return WHITESPACE_RE.sub(' ', s).strip()
+
+def remove_internal_repeats(s):
+    # "J Yumi 10am-2pm J Yumi 10am-2pm" -> "J Yumi 10am-2pm" (repeats of 3-9 words)
+    words = s.split()
+    n = len(words)
+    for size in range(3, min(10, n // 2 + 1)):
+        for i in range(n - 2 * size + 1):
+            if words[i:i + size] == words[i + size:i + 2 * size]:
+                return ' '.join(words[:i + size])
+    return s
+
+def core_text(s):
+    # The entry without "New"/"Diamond Class" badges; duplicates share the same core
+    core = NEW_RE.sub('', s).strip()
+    core = DIAMOND_CLASS_RE.sub('', core).strip()
+    return WHITESPACE_RE.sub(' ', core)
+
+def parse_entry(text, rules):
+    # Split "Name ... 10am-2pm trailing info" into a RosterEntry, or None if there is no time range
+    match = NAME_TIME_RE.match(text)
+    if match:
+        name, start, end = match.groups()
+    else:
+        match = TIME_RANGE_RE.search(text)
+        if not match:
+            return None
+        name = text[:match.start()]
+        start, end = match.groups()
+    for pattern in rules['name_noise']:
+        name = pattern.sub('', name)
+    name = collapse_spaces(name)
+    if not name:
+        return None
+    return RosterEntry(name, start.strip(), end.strip())
+
+def format_entry(entry):
+    return f'{entry.name} {entry.start}-{entry.end}'
+
+def normalize_entries(raw_entries, venue):
+    """Turn the raw text entries collected from one roster block into RosterEntry
+    records, in a single pass: repeats and badge-only variants collapse onto the
+    first occurrence, and entries without a time range are dropped."""
+    rules = VENUE_RULES[venue]
+    seen_cores = set()
+    entries = []
+    for raw in raw_entries:
+        core = core_text(remove_internal_repeats(raw))
+        if not core or core in seen_cores:
+            continue
+        seen_cores.add(core)
+        entry = parse_entry(core, rules)
+        if entry is not None:
+            entries.append(entry)
+    if rules['dedupe']:
+        entries = list(dict.fromkeys(entries))
+    return entries
+
+def normalize_names(raw_entries, venue):
+    return [format_entry(entry) for entry in normalize_entries(raw_entries, venue)]
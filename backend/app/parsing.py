@@ -0,0 +1,124 @@
+from bs4 import BeautifulSoup, SoupStrainer
+import tracemalloc
+import logging
+import time
+import os
+
+logger = logging.getLogger(__name__)
+
+# Optional faster backends: lxml for BeautifulSoup, selectolax (lexbor) to cut out
+# the roster fragments before BeautifulSoup ever sees the page
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+# tracemalloc slows every allocation in the process, so peak memory is opt-in
+PARSE_TRACE_MEMORY = os.environ.get('PARSE_TRACE_MEMORY', '0') == '1'
+
+# JS run in the browser to return just the outermost elements matching a selector
+FRAGMENTS_SCRIPT = """
+const selector = arguments[0];
+return Array.from(document.querySelectorAll(selector))
+    .filter(el => !el.parentElement || !el.parentElement.closest(selector))
+    .map(el => el.outerHTML)
+    .join('');
+"""
+
+def style_has_margin_bottom(value):
+    return bool(value) and 'margin-bottom: 20px' in value
+
+def has_clearfix_class(value):
+    return bool(value) and 'clearfix' in (value if isinstance(value, list) else value.split())
+
+# SoupStrainer equivalents of the fragment selectors, for when selectolax isn't installed
+NO5_STRAINER = SoupStrainer('div', id=['nav-rostertoday', 'nav-rostertomorrow'])
+GINZA_STRAINER = SoupStrainer('div', attrs={'class': has_clearfix_class, 'style': style_has_margin_bottom})
+# By name, so venue declarations don't have to import BeautifulSoup
+STRAINERS = {
+    'no5': NO5_STRAINER,
+    'ginza': GINZA_STRAINER,
+}
+
+def select_fragments(html, fragment_selector):
+    # Outer HTML of the outermost nodes matching the selector (nested matches are kept inside them)
+    tree = LexborHTMLParser(html)
+    nodes = tree.css(fragment_selector)
+    matched = {node.mem_id for node in nodes}
+    fragments = []
+    for node in nodes:
+        parent = node.parent
+        while parent is not None and parent.mem_id not in matched:
+            parent = parent.parent
+        if parent is None:
+            fragments.append(node.html)
+    return ''.join(fragments)
+
+# Selection methods whose output is exactly the roster fragments' HTML
+FRAGMENT_METHODS = ('selectolax', 'browser-fragment')
+
+def select_roster_html(html, fragment_selector=None, strainer=None, is_fragment=False):
+    """Cut the roster parts out of a page without building a BeautifulSoup tree.
+
+    ``is_fragment`` means ``html`` was already cut down (e.g. in the browser).
+    Otherwise the fragments are selected with selectolax if available; without it
+    the page is returned whole and ``strainer`` narrows it during parsing.
+    Returns ``(html, method)``.
+    """
+    if is_fragment:
+        return html, 'browser-fragment'
+    if fragment_selector and LexborHTMLParser is not None:
+        return select_fragments(html, fragment_selector), 'selectolax'
+    if strainer is not None:
+        return html, 'strainer'
+    return html, 'full'
+
+def parse_selected_html(html, method, strainer=None, select_seconds=0.0):
+    # Build the BeautifulSoup tree for select_roster_html() output; returns (soup, stats)
+    started = time.perf_counter()
+    soup = BeautifulSoup(html, HTML_PARSER, parse_only=strainer if method == 'strainer' else None)
+    stats = {
+        'parser': HTML_PARSER,
+        'method': method,
+        'bytes': len(html),
+        'select_seconds': round(select_seconds, 4),
+        'parse_seconds': round(time.perf_counter() - started, 4),
+    }
+    return soup, stats
+
+def parse_roster_html(html, fragment_selector=None, strainer=None, is_fragment=False):
+    """Parse only the roster parts of a page into a BeautifulSoup tree.
+
+    See select_roster_html() for how the parts are chosen. Returns ``(soup, stats)``.
+    """
+    started = time.perf_counter()
+    html, method = select_roster_html(html, fragment_selector, strainer, is_fragment)
+    return parse_selected_html(html, method, strainer, time.perf_counter() - started)
+
+class MemoryTracker:
+    """Context manager recording peak traced memory while active.
+
+    Only meaningful with PARSE_TRACE_MEMORY=1; pages parsed concurrently share
+    one tracemalloc peak, so treat the numbers as an upper bound per page.
+    """
+
+    def __init__(self):
+        self.peak_bytes = None
+
+    def __enter__(self):
+        if PARSE_TRACE_MEMORY:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+        return self
+
+    def __exit__(self, *exc_info):
+        if PARSE_TRACE_MEMORY:
+            self.peak_bytes = tracemalloc.get_traced_memory()[1]
+        return False
@@ -0,0 +1,93 @@
+from .storage import RESULTS_PATH
+import hashlib
+import threading
+import json
+import gzip
+import os
+
+class Snapshot:
+    """A parsed results file plus its ready-to-send response bodies."""
+
+    __slots__ = ('data', 'body', 'gzip_body', 'etag')
+
+    def __init__(self, data):
+        self.data = data
+        self.body = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        self.gzip_body = gzip.compress(self.body, compresslevel=6)
+        self.etag = '"%s"' % hashlib.sha1(self.body).hexdigest()
+
+    def matches(self, if_none_match):
+        if not if_none_match:
+            return False
+        tags = [tag.strip() for tag in if_none_match.split(',')]
+        return '*' in tags or any(tag.removeprefix('W/') == self.etag for tag in tags)
+
+class ResultsStore:
+    """Keeps the latest results in memory, reloading only when the file changes.
+
+    A ``stat`` per lookup replaces the open + ``json.load`` that used to run on
+    every ``/results`` hit; writers call ``update`` so the new data is served
+    without even a reload.
+    """
+
+    def __init__(self, filename=RESULTS_PATH):
+        self.filename = filename
+        self._lock = threading.Lock()
+        self._snapshot = None
+        self._file_state = None
+        self._listeners = []
+
+    def _stat(self):
+        try:
+            st = os.stat(self.filename)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def add_listener(self, listener):
+        # listener(data) is called whenever new results are seen, whoever wrote them
+        self._listeners.append(listener)
+
+    def _notify(self, snapshot):
+        for listener in self._listeners:
+            listener(snapshot.data)
+
+    def get(self):
+        state = self._stat()
+        changed = False
+        with self._lock:
+            if state != self._file_state:
+                previous = self._snapshot
+                self._snapshot = self._load() if state else None
+                self._file_state = state
+                changed = self._snapshot is not None and self._snapshot is not previous
+            snapshot = self._snapshot
+        if changed:
+            self._notify(snapshot)
+        return snapshot
+
+    def _load(self):
+        try:
+            with open(self.filename, "r", encoding="utf-8") as f:
+                return Snapshot(json.load(f))
+        except (ValueError, FileNotFoundError):
+            # Writes are atomic renames, but an externally edited file may still be bad or gone
+            return self._snapshot
+
+    def update(self, data):
+        snapshot = Snapshot(data)
+        state = self._stat()
+        with self._lock:
+            self._snapshot = snapshot
+            self._file_state = state
+        self._notify(snapshot)
+        return snapshot
+
+    def invalidate(self):
+        with self._lock:
+            self._file_state = None
+
+    def owns(self, filename):
+        return os.path.abspath(filename) == os.path.abspath(self.filename)
+
+results_store = ResultsStore()
@@ -0,0 +1,156 @@
+from concurrent.futures import ThreadPoolExecutor
+from .venues import VENUES
+from .clock import sydney_iso_from_timestamp
+from .jobs import job_manager
+import asyncio
+import logging
+import random
+import time
+import os
+
+logger = logging.getLogger(__name__)
+
+# Scheduler settings (overridable via environment)
+SCRAPE_SCHEDULER = os.environ.get('SCRAPE_SCHEDULER', '0') == '1'
+SCRAPE_INTERVAL = float(os.environ.get('SCRAPE_INTERVAL', '3600'))
+SCRAPE_JITTER = float(os.environ.get('SCRAPE_JITTER', '0.1'))
+SCRAPE_RETRY_MAX = float(os.environ.get('SCRAPE_RETRY_MAX', '21600'))
+
+def parse_intervals(spec, default=SCRAPE_INTERVAL):
+    # "no5=1800,ginza=7200" -> {'no5': 1800.0, 'ginza': 7200.0, 'ginza479': default}
+    intervals = {key: venue.interval or default for key, venue in VENUES.items()}
+    for item in filter(None, (part.strip() for part in spec.split(','))):
+        key, _, seconds = item.partition('=')
+        if key.strip() not in VENUES:
+            raise ValueError(f'Unknown venue in SCRAPE_INTERVALS: {key!r}')
+        intervals[key.strip()] = float(seconds)
+    return intervals
+
+class VenueSchedule:
+    def __init__(self, key, interval):
+        self.key = key
+        self.interval = interval
+        self.next_run = None
+        self.running = False
+        self.failures = 0
+        self.skipped = 0
+        self.last_started = None
+        self.last_success = None
+        self.last_error = None
+
+    def to_dict(self):
+        def iso(ts):
+            return sydney_iso_from_timestamp(ts) if ts else None
+        return {
+            'venue': self.key,
+            'interval_seconds': self.interval,
+            'next_run': iso(self.next_run),
+            'running': self.running,
+            'consecutive_failures': self.failures,
+            'skipped_ticks': self.skipped,
+            'last_started': iso(self.last_started),
+            'last_success': iso(self.last_success),
+            'last_error': self.last_error,
+        }
+
+class Scheduler:
+    """Scrapes each venue on its own interval from inside the API process.
+
+    Intervals get +/- ``jitter`` so venues drift apart, a tick is skipped while
+    the previous run for that venue (or a full or same-venue scrape job) is
+    still going, and failures back off exponentially from the venue's interval
+    up to ``retry_max``, so a failing site is never retried sooner than a
+    healthy one is scraped.
+    """
+
+    def __init__(self, intervals, jitter=SCRAPE_JITTER, retry_max=SCRAPE_RETRY_MAX):
+        self.venues = {key: VenueSchedule(key, interval) for key, interval in intervals.items()}
+        self.jitter = jitter
+        self.retry_max = retry_max
+        self._executor = None
+        self._task = None
+        self._runs = set()
+        self._finished = None  # set by a run when it reschedules its venue
+
+    def _jittered(self, seconds):
+        return seconds * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def _backoff(self, venue):
+        return min(venue.interval * 2 ** venue.failures, max(self.retry_max, venue.interval))
+
+    def start(self):
+        # Only a process that runs the scheduler pays for importing the scraping stack
+        from .scraper import scrape_venue, SCRAPE_MAX_WORKERS
+        self._scrape_venue = scrape_venue
+        now = time.time()
+        for venue in self.venues.values():
+            # Spread the first runs out instead of launching every browser at startup
+            venue.next_run = now + random.uniform(0, self.jitter * venue.interval)
+        self._executor = ThreadPoolExecutor(max_workers=max(1, SCRAPE_MAX_WORKERS),
+                                            thread_name_prefix='scheduler')
+        self._finished = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for run in list(self._runs):
+            run.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _loop(self):
+        while True:
+            now = time.time()
+            for venue in self.venues.values():
+                if venue.next_run > now:
+                    continue
+                if venue.running or job_manager.busy(venue.key):
+                    venue.skipped += 1
+                    venue.next_run = now + self._jittered(venue.interval)
+                    logger.info('Skipping scheduled scrape of %s: previous run still going', venue.key)
+                    continue
+                venue.running = True
+                # Provisional next tick; a run that outlasts it makes that tick skip
+                venue.next_run = now + self._jittered(venue.interval)
+                run = asyncio.create_task(self._run_venue(venue))
+                self._runs.add(run)
+                run.add_done_callback(self._runs.discard)
+            wake = min(venue.next_run for venue in self.venues.values())
+            # Sleep until the next tick, or until a run finishes and reschedules its venue
+            self._finished.clear()
+            try:
+                await asyncio.wait_for(self._finished.wait(), max(1.0, wake - time.time()))
+            except asyncio.TimeoutError:
+                pass
+
+    async def _run_venue(self, venue):
+        venue.last_started = time.time()
+        try:
+            await asyncio.get_running_loop().run_in_executor(self._executor, self._scrape_venue, venue.key)
+        except Exception as exc:
+            venue.failures += 1
+            venue.last_error = f'{type(exc).__name__}: {exc}'
+            venue.next_run = time.time() + self._backoff(venue)
+            logger.warning('Scheduled scrape of %s failed (%d in a row): %s',
+                           venue.key, venue.failures, venue.last_error)
+        else:
+            venue.failures = 0
+            venue.last_error = None
+            venue.last_success = time.time()
+            venue.next_run = venue.last_success + self._jittered(venue.interval)
+        finally:
+            venue.running = False
+            self._finished.set()
+
+    def status(self):
+        return [venue.to_dict() for venue in self.venues.values()]
+
+def create_scheduler():
+    return Scheduler(parse_intervals(os.environ.get('SCRAPE_INTERVALS', '')))
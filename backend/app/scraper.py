@@ -1,467 +1,350 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
+from concurrent.futures import ThreadPoolExecutor, wait
+import threading
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
-import datetime
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from .browser_pool import get_pool
+from .fetch import get_http_html
+from .parsing import (
+    parse_roster_html, select_roster_html, parse_selected_html, MemoryTracker,
+    FRAGMENTS_SCRIPT, FRAGMENT_METHODS, HTML_PARSER,
+)
+from .results_store import results_store
+from .database import record_history
+from .storage import RESULTS_PATH, LAST_SCRAPE_PATH, atomic_write_json, data_path, file_lock, read_json
+from .venues import VENUES
+from .clock import now_sydney_iso
+from .metrics import venue_run, stage, log_scrape_run
+import hashlib
+import logging
 import time
 import json
-import re
 import os
 
-def now_sydney_iso():
+logger = logging.getLogger(__name__)
+
+# Concurrent scrape settings (overridable via environment)
+SCRAPE_MAX_WORKERS = int(os.environ.get('SCRAPE_MAX_WORKERS', '3'))
+SCRAPE_DEADLINE = float(os.environ.get('SCRAPE_DEADLINE', '90'))
+PAGE_READY_TIMEOUT = float(os.environ.get('PAGE_READY_TIMEOUT', '10'))
+
+# Most recent readiness timing per URL, for tuning the selectors/timeout
+readiness_timings = {}
+# Which fetch path ('http' or 'browser') last produced each URL's roster
+fetch_paths = {}
+# Most recent parse/extract timings and peak memory per URL
+parse_stats = {}
+# Per-URL fingerprints, HTTP validators and parsed roster from the last successful scrape
+page_cache = {}
+# Serialises read-merge-write of latest_results.json between full and single-venue scrapes;
+# the file lock extends that to other worker processes
+_save_lock = threading.Lock()
+
+def wait_until_ready(driver, ready_selector=None, timeout=PAGE_READY_TIMEOUT):
+    # Returns True once the selector matches (or the document has loaded if no selector)
+    if ready_selector:
+        condition = EC.presence_of_element_located((By.CSS_SELECTOR, ready_selector))
+    else:
+        condition = lambda d: d.execute_script('return document.readyState') == 'complete'
     try:
-        import pytz
-        SYDNEY_TZ = pytz.timezone('Australia/Sydney')
-        return datetime.datetime.now(SYDNEY_TZ).isoformat()
-    except ImportError:
-        # Fallback to UTC if pytz is not available
-        return datetime.datetime.now().isoformat()
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(condition)
+        return True
+    except TimeoutException:
+        return False
 
-def get_selenium_soup(url):
-    options = Options()
-    options.add_argument('--headless')
-    options.add_argument('--no-sandbox')
-    options.add_argument('--disable-dev-shm-usage')
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=options)
-    driver.get(url)
-    time.sleep(3)
-    soup = BeautifulSoup(driver.page_source, "html.parser")
-    driver.quit()
+def get_selenium_html(url, ready_selector=None, timeout=PAGE_READY_TIMEOUT, fragment_selector=None):
+    # Returns (html, is_fragment); with a fragment_selector only those elements are serialised, in the browser
+    with get_pool().session() as driver:
+        started = time.perf_counter()
+        with stage('page_load'):
+            try:
+                driver.get(url)
+            except TimeoutException:
+                # Hit the page-load timeout: stop loading and use whatever has rendered
+                logger.warning('%s still loading after the page-load timeout, stopping it', url)
+                driver.execute_script('window.stop();')
+        loaded = time.perf_counter()
+        with stage('ready_wait'):
+            ready = wait_until_ready(driver, ready_selector, timeout)
+        finished = time.perf_counter()
+        with stage('page_source'):
+            if fragment_selector:
+                html = driver.execute_script(FRAGMENTS_SCRIPT, fragment_selector) or ''
+            else:
+                html = driver.page_source
+    timing = {
+        'load_seconds': round(loaded - started, 3),
+        'ready_wait_seconds': round(finished - loaded, 3),
+        'ready': ready,
+        'selector': ready_selector,
+    }
+    readiness_timings[url] = timing
+    if ready:
+        logger.info('%s ready after %.2fs (+%.2fs load)', url, timing['ready_wait_seconds'], timing['load_seconds'])
+    else:
+        # Scrape whatever rendered rather than failing the venue outright
+        logger.warning('%s not ready after %.1fs waiting for %r', url, timeout, ready_selector)
+    return html, bool(fragment_selector)
+
+def get_selenium_soup(url, ready_selector=None, timeout=PAGE_READY_TIMEOUT, fragment_selector=None, strainer=None):
+    html, is_fragment = get_selenium_html(url, ready_selector, timeout, fragment_selector)
+    soup, _ = parse_roster_html(html, fragment_selector, strainer, is_fragment)
     return soup
 
-def extract_no5_roster():
-    url = "https://no5marrickville.com/#roster"
-    soup = get_selenium_soup(url)
-    def extract_roster_from_timetable(soup, roster_id):
-        container = soup.find('div', id=roster_id)
-        roster = []
-        if container:
-            timetable = container.find('div', class_='timetable')
-            if timetable:
-                rows = timetable.find_all('div', class_='timetable__row')
-                for row in rows:
-                    name_elem = row.find('p', class_='timetable__name')
-                    time_elem = row.find('p', class_='timetable__time')
-                    name = name_elem.get_text(strip=True) if name_elem else None
-                    time_ = time_elem.get_text(strip=True) if time_elem else None
-                    if name or time_:
-                        roster.append({'name': name, 'time': time_})
-        return roster
-    today = extract_roster_from_timetable(soup, 'nav-rostertoday')
-    tomorrow = extract_roster_from_timetable(soup, 'nav-rostertomorrow')
-    return {
-        'title': 'Marrickville',
-        'today': today,
-        'tomorrow': tomorrow,
-        'timestamp': now_sydney_iso()
-    }
+def roster_soup(html, fragment_selector=None, strainer=None, is_fragment=False, known_fragment=None):
+    """Select and parse a page's roster; returns (soup, parse_stats, fragment fingerprint).
 
-def extract_ginza_roster():
-    url = "https://www.ginzaclub.com.au/Roster"
-    soup = get_selenium_soup(url)
-    # Find all roster blocks
-    roster_blocks = soup.find_all('div', class_='clearfix', style=lambda v: v and 'margin-bottom: 20px' in v)
-    results = []
-    for block in roster_blocks:
-        # Try to extract a date/title if present
-        title = None
-        strongs = block.find_all('strong')
-        for s in strongs:
-            if s.text.strip():
-                title = s.text.strip()
-                break
-        names = []
-        # Only extract from <div class='info'> inside the block
-        info_div = block.find('div', class_='info')
-        if info_div:
-            # For each <p>, try multiple extraction approaches
-            for p in info_div.find_all('p'):
-                spans = p.find_all('span')
-                
-                # Get direct text from <p> first (often has the clean version)
-                p_direct_text = p.get_text(" ", strip=True)
-                
-                # Check if p direct text contains a complete roster entry and use it directly
-                # More flexible pattern to catch cases like "J Yumi 10.30a m -12am"
-                if re.search(r'[A-Z]\s+\w+\s+\d{1,2}(?:[:\.]\d{2})?\s*[ap]?\s*m?\s*-\s*\d{1,2}(?:[:\.]\d{2})?\s*[ap]m', p_direct_text, re.IGNORECASE):
-                    # Clean up the direct text and use it
-                    cleaned = re.sub(r'\(PHOTO\)|\bDiamond\s+Class\b|\bNew\b', '', p_direct_text, flags=re.IGNORECASE)
-                    cleaned = re.sub(r'\s+', ' ', cleaned).strip()
-                    
-                    # Fix specific time formatting issues in the direct text
-                    # "10.30a m -12am" -> "10.30am-12am"
-                    cleaned = re.sub(r'(\d+\.?\d*)a\s+m\s*-', r'\1am-', cleaned)
-                    cleaned = re.sub(r'(\d+\.?\d*)p\s+m\s*-', r'\1pm-', cleaned)
-                    # Remove extra spaces between time components and normalize spacing
-                    cleaned = re.sub(r'(\d+\.?\d*[ap]m)\s*-\s*(\d+\.?\d*[ap]m)', r'\1-\2', cleaned)
-                    
-                    names.append(cleaned)
-                    continue  # Skip span-based extraction for this <p>
-                
-                # If spans exist, work with them but be more careful about duplicates
-                if spans:
-                    # Get unique span texts (avoid processing identical spans)
-                    unique_span_texts = []
-                    seen_texts = set()
-                    
-                    for span in spans:
-                        span_text = span.get_text(" ", strip=True)
-                        if span_text and span_text not in seen_texts:
-                            unique_span_texts.append(span_text)
-                            seen_texts.add(span_text)
-                    
-                    # Try to find the best combination from unique spans
-                    if len(unique_span_texts) >= 2:
-                        # Look for a name + time combination
-                        for i, first_span in enumerate(unique_span_texts):
-                            # Skip if this looks like metadata
-                            if any(x in first_span.lower() for x in ['photo', 'diamond', 'class', 'korean', 'indian']):
-                                continue
-                            
-                            # Check if this could be a name
-                            if re.match(r'^[A-Z]\s+\w+', first_span, re.IGNORECASE):
-                                # Look for time in remaining spans
-                                for j, second_span in enumerate(unique_span_texts[i+1:], i+1):
-                                    if ('am' in second_span or 'pm' in second_span) and '-' in second_span:
-                                        combined = f"{first_span} {second_span}"
-                                        # Apply time fixes
-                                        combined = re.sub(r'(\d+\.?\d*a)\s+(m-\d+\.?\d*(?:am|pm))', r'\1\2', combined, flags=re.IGNORECASE)
-                                        combined = re.sub(r'(\d+\.?\d*(?:am|pm))\s+(-\d+\.?\d*(?:am|pm))', r'\1\2', combined, flags=re.IGNORECASE)
-                                        names.append(combined.strip())
-                                        break
-                                break
-                    
-                    # If no combination found, try reconstructing from fragments
-                    if not names or not any(unique_span_texts[0] in name for name in names):
-                        full_text = " ".join(unique_span_texts)
-                        
-                        # Look for name pattern
-                        name_match = re.match(r'^([A-Z]\s+\w+(?:\s+\(PHOTO\))?)', full_text, re.IGNORECASE)
-                        if name_match:
-                            name_part = name_match.group(1)
-                            name_part = re.sub(r'\s*\(PHOTO\)\s*', ' ', name_part).strip()
-                            
-                            # Get time components
-                            time_components = full_text[len(name_match.group(1)):].strip()
-                            time_clean = re.sub(r'\(PHOTO\)|\(No Korean[^)]*\)|\bDiamond\s+Class\b|\bNew\b', '', time_components, flags=re.IGNORECASE)
-                            time_clean = re.sub(r'\s+', ' ', time_clean).strip()
-                            
-                            # Try to reconstruct time
-                            time_reconstructed = time_clean
-                            time_reconstructed = re.sub(r'(\d+\.?\d*)a\s+m\s*-', r'\1am-', time_reconstructed)
-                            time_reconstructed = re.sub(r'(\d+\.?\d*)p\s+m\s*-', r'\1pm-', time_reconstructed)
-                            time_reconstructed = re.sub(r'(\d+)\s+(\.\d+[ap]m-\d+)\s+(\d+[ap]m)', r'\1\2\3', time_reconstructed)
-                            time_reconstructed = re.sub(r'\s+', '', time_reconstructed)
-                            
-                            # Check for valid time pattern
-                            if re.search(r'\d+\.?\d*[ap]m-\d+\.?\d*[ap]m', time_reconstructed, re.IGNORECASE):
-                                combined = f"{name_part} {time_reconstructed}"
-                                names.append(combined.strip())
-                
-                elif not spans:
-                    # fallback: treat the whole <p> as before
-                    txt = p.get_text(" ", strip=True)
-                    if ("am" in txt or "pm" in txt or "-" in txt):
-                        names.append(txt)
-            # Also check for <span> tags not inside <p> (if any)
-            for tag in info_div.find_all('span'):
-                if tag.parent.name != 'p':
-                    txt = tag.get_text(" ", strip=True)
-                    # Only add if not already present in names
-                    if ("am" in txt or "pm" in txt or "-" in txt) and all(txt not in n for n in names):
-                        names.append(txt)
-        # Remove repeated phrases within a single entry
-        def remove_internal_repeats(s):
-            # If a phrase is repeated immediately, keep only one
-            words = s.strip().split()
-            n = len(words)
-            for size in range(3, min(10, n//2+1)):
-                for i in range(n - 2*size + 1):
-                    if words[i:i+size] == words[i+size:i+2*size]:
-                        # Remove the repeated block
-                        return ' '.join(words[:i+size])
-            return s
-        cleaned_names = [remove_internal_repeats(n) for n in names]
-        
-        # Enhanced deduplication: prefer entries without "Diamond Class" when duplicates exist
-        # Group entries by their core name+time (without Diamond Class)
-        core_to_entries = {}
-        
-        def get_core_name(s):
-            # Remove "Diamond Class", "New", and clean up spacing
-            core = re.sub(r'\bNew\b', '', s, flags=re.IGNORECASE).strip()
-            core = re.sub(r'\bDiamond\s+Class\b', '', core, flags=re.IGNORECASE).strip()
-            core = re.sub(r'\s+', ' ', core)
-            return core
-        
-        # Group entries by their core representation
-        for entry in cleaned_names:
-            core = get_core_name(entry)
-            if core not in core_to_entries:
-                core_to_entries[core] = []
-            core_to_entries[core].append(entry)
-        
-        # For each core, pick the best entry (shortest, cleanest)
-        unique_names = []
-        for core, entries in core_to_entries.items():
-            if not entries:
-                continue
-                
-            # Sort by: 1) entries without "Diamond Class" first, 2) then by length
-            def entry_priority(entry):
-                has_diamond_class = 'Diamond Class' in entry
-                return (has_diamond_class, len(entry), entry)
-            
-            best_entry = sorted(entries, key=entry_priority)[0]
-            
-            # Clean up the best entry
-            cleaned = re.sub(r'\bNew\b', '', best_entry, flags=re.IGNORECASE).strip()
-            cleaned = re.sub(r'\bDiamond\s+Class\b', '', cleaned, flags=re.IGNORECASE).strip()
-            cleaned = re.sub(r'\s+', ' ', cleaned)
-            
-            if cleaned:  # Only add non-empty entries
-                unique_names.append(cleaned)
-        
-        # Only keep entries that have a valid time range (start and end time)
-        final_names = []
-        for entry in unique_names:
-            # Accept time formats like 10am-2pm, 10.30am-2am, 10:30am-6pm, 10.30am-6pm, etc.
-            time_match = re.search(r'(\d{1,2}(?:[:\.]\d{2})? ?[ap]m\s*-\s*\d{1,2}(?:[:\.]\d{2})? ?[ap]m)', entry, re.IGNORECASE)
-            if time_match:
-                # Extract just the name and time, removing extra content
-                # Pattern: Name + Time, ignore everything after the time
-                name_time_pattern = r'^([A-Z][^0-9]*?)(\d{1,2}(?:[:\.]\d{2})? ?[ap]m\s*-\s*\d{1,2}(?:[:\.]\d{2})? ?[ap]m)'
-                name_time_match = re.match(name_time_pattern, entry, re.IGNORECASE)
-                
-                if name_time_match:
-                    name_part = name_time_match.group(1).strip()
-                    time_part = name_time_match.group(2).strip()
-                    
-                    # Clean up the name part
-                    name_part = re.sub(r'\(PHOTO\)|\bDiamond\s+Class\b|\bNew\b', '', name_part, flags=re.IGNORECASE)
-                    name_part = re.sub(r'\s+', ' ', name_part).strip()
-                    
-                    # Normalize time format (remove spaces around dash) BEFORE adding to final_names
-                    time_part = re.sub(r'(\d+\.?\d*[ap]m)\s*-\s*(\d+\.?\d*[ap]m)', r'\1-\2', time_part, flags=re.IGNORECASE)
-                    
-                    # Combine clean name and time
-                    cleaned = f"{name_part} {time_part}"
-                    final_names.append(cleaned)
-                else:
-                    # Fallback: basic cleanup if pattern matching fails
-                    cleaned = re.sub(r'\(PHOTO\)|\bDiamond\s+Class\b|\bNew\b', '', entry, flags=re.IGNORECASE)
-                    # Remove content after time pattern that looks like extra info
-                    cleaned = re.sub(r'(\d{1,2}(?:[:\.]\d{2})? ?[ap]m)\s*[^\w]*.*$', r'\1', cleaned, flags=re.IGNORECASE)
-                    # Normalize time spacing BEFORE adding to final_names
-                    cleaned = re.sub(r'(\d+\.?\d*[ap]m)\s*-\s*(\d+\.?\d*[ap]m)', r'\1-\2', cleaned, flags=re.IGNORECASE)
-                    cleaned = re.sub(r'\s+', ' ', cleaned).strip()
-                    final_names.append(cleaned)
+    When the fragments can be cut out without BeautifulSoup (selectolax, or in the
+    browser) they are hashed first, and if they match ``known_fragment`` no tree
+    is built at all: soup is None and the previous roster still applies.
+    """
+    started = time.perf_counter()
+    with stage('select'):
+        selected, method = select_roster_html(html, fragment_selector, strainer, is_fragment)
+    select_seconds = time.perf_counter() - started
+    fragment = fingerprint(selected) if method in FRAGMENT_METHODS else None
+    if fragment is not None and fragment == known_fragment:
+        stats = {'parser': HTML_PARSER, 'method': method, 'bytes': len(selected),
+                 'select_seconds': round(select_seconds, 4), 'parse_seconds': 0.0, 'parse_skipped': True}
+        return None, stats, fragment
+    with stage('parse'):
+        soup, stats = parse_selected_html(selected, method, strainer, select_seconds)
+    if fragment is None:
+        # Strainer/full parse: the fragments only exist once the tree is built
+        fragment = fragment_fingerprint(soup, fragment_selector)
+    return soup, stats, fragment
 
-        # Final deduplication step - remove exact duplicates that may have slipped through
-        final_names = list(dict.fromkeys(final_names))  # Preserves order while removing duplicates
-        results.append({
-            'title': title or 'Ginza Roster',
-            'names': final_names
-        })
-    
-    # Don't merge rosters - keep them separate for today/tomorrow
-    # Just do final deduplication within each roster
-    for roster in results:
-        # Remove exact duplicates within this roster only
-        roster['names'] = list(dict.fromkeys(roster['names']))
-    
-    return {
-        'title': 'Cleveland',
-        'rosters': results,  # Keep all separate roster blocks
-        'timestamp': now_sydney_iso()
-    }
+def fetch_soup(url, ready_selector, fragment_selector=None, strainer=None, validators=None, strategy='auto',
+               known_fragment=None):
+    # 'auto': try a cheap HTTP GET first; only render in Chrome if the roster isn't in the raw HTML.
+    # Returns (soup, source, validators, parse_stats, fragment). soup is None if the server
+    # answered 304 (fragment is None too) or the fragment matched ``known_fragment``.
+    if strategy != 'browser':
+        with stage('http_fetch'):
+            html, validators = get_http_html(url, validators)
+        if html is None and validators is not None:
+            fetch_paths[url] = 'http'
+            return None, 'http', validators, None, None
+        if html is not None:
+            soup, stats, fragment = roster_soup(html, fragment_selector, strainer, known_fragment=known_fragment)
+            # An unchanged fragment was accepted last time, so the roster is in the raw HTML
+            if (strategy == 'http' or not ready_selector or soup is None
+                    or soup.select_one(ready_selector) is not None):
+                fetch_paths[url] = 'http'
+                return soup, 'http', validators, stats, fragment
+            logger.info('%s: roster markup not in initial HTML', url)
+        elif strategy == 'http':
+            raise RuntimeError(f'HTTP fetch of {url} failed')
+    html, is_fragment = get_selenium_html(url, ready_selector, fragment_selector=fragment_selector)
+    soup, stats, fragment = roster_soup(html, fragment_selector, strainer, is_fragment, known_fragment)
+    fetch_paths[url] = 'browser'
+    # No validators for rendered pages: the roster can change without the HTML changing
+    return soup, 'browser', None, stats, fragment
 
-def extract_479ginza_roster():
-    url = "https://www.479ginza.com.au/Roster"
-    soup = get_selenium_soup(url)
-    roster_blocks = soup.find_all('div', class_='clearfix', style=lambda v: v and 'margin-bottom: 20px' in v)
-    results = []
-    for block in roster_blocks:
-        title = None
-        strongs = block.find_all('strong')
-        for s in strongs:
-            if s.text.strip():
-                title = s.text.strip()
-                break
-        names = []
-        
-        # Look for entries in both <div class='info'> and direct child divs
-        info_div = block.find('div', class_='info')
-        divs_to_check = [info_div] if info_div else []
-        
-        # Also check direct child divs that might not have the 'info' class
-        for child_div in block.find_all('div', recursive=False):
-            if child_div not in divs_to_check:
-                divs_to_check.append(child_div)
-        
-        for div_to_process in divs_to_check:
-            if div_to_process:
-                # Get all text from each <p> tag and look for roster entries
-                for p in div_to_process.find_all('p'):
-                    full_text = p.get_text(" ", strip=True)
-                    
-                    # Look for patterns like "V Fiona 1pm-4am" or "J Kitty 12pm-4am" in the text
-                    # Match entries that have a time range - improved pattern to handle more cases
-                    # Pattern explanation: captures name + time range, but NOT the "Diamond Class" suffix
-                    time_pattern = r'([A-Z]\w*\s+\w+\s+\d{1,2}(?::\d{2})?(?:am|pm)\s*-\s*\d{1,2}(?::\d{2})?(?:am|pm))'
-                    matches = re.findall(time_pattern, full_text, re.IGNORECASE)
-                    
-                    for match in matches:
-                        # Clean up the match
-                        cleaned_match = re.sub(r'\s+', ' ', match.strip())
-                        names.append(cleaned_match)
-                    
-                    # Also extract from individual spans that contain roster entries
-                    spans = p.find_all('span')
-                    for span in spans:
-                        span_text = span.get_text(" ", strip=True)
-                        # Look for roster entries within spans - more flexible pattern
-                        if re.search(r'[A-Z]\w*\s+\w+\s+\d{1,2}(?::\d{2})?(?:am|pm)\s*-\s*\d{1,2}(?::\d{2})?(?:am|pm)', span_text, re.IGNORECASE):
-                            # Clean up and add the span text
-                            cleaned_span = re.sub(r'\s+', ' ', span_text.strip())
-                            names.append(cleaned_span)
-                    
-                    # Original span-based approach for compatibility
-                    name_part = None
-                    time_part = None
-                    for span in spans:
-                        txt = span.get_text(" ", strip=True)
-                        if not name_part and txt and not txt.startswith('New') and len(txt) > 3:
-                            name_part = txt
-                            continue
-                        if name_part and not time_part and txt and ('am' in txt or 'pm' in txt):
-                            time_part = txt
-                            break
-                    if name_part and time_part:
-                        combined = f"{name_part} {time_part}"
-                        names.append(combined.strip())
-                    elif not spans:
-                        # fallback: treat the whole <p> as before
-                        if ("am" in full_text or "pm" in full_text) and "-" in full_text:
-                            names.append(full_text)
-                
-                # Also check for <span> tags not inside <p> (if any)
-                for tag in div_to_process.find_all('span'):
-                    if tag.parent.name != 'p':
-                        txt = tag.get_text(" ", strip=True)
-                        # Only add if not already present in names
-                        if ("am" in txt or "pm" in txt or "-" in txt) and all(txt not in n for n in names):
-                            names.append(txt)
-        # Remove repeated phrases within a single entry
-        def remove_internal_repeats(s):
-            # If a phrase is repeated immediately, keep only one
-            words = s.strip().split()
-            n = len(words)
-            for size in range(3, min(10, n//2+1)):
-                for i in range(n - 2*size + 1):
-                    if words[i:i+size] == words[i+size:i+2*size]:
-                        # Remove the repeated block
-                        return ' '.join(words[:i+size])
-            return s
-        cleaned_names = [remove_internal_repeats(n) for n in names]
-        
-        # Enhanced deduplication: prefer entries without "Diamond Class" when duplicates exist
-        # Group entries by their core name+time (without Diamond Class)
-        core_to_entries = {}
-        
-        def get_core_name(s):
-            # Remove "Diamond Class", "New", and clean up spacing
-            core = re.sub(r'\bNew\b', '', s, flags=re.IGNORECASE).strip()
-            core = re.sub(r'\bDiamond\s+Class\b', '', core, flags=re.IGNORECASE).strip()
-            core = re.sub(r'\s+', ' ', core)
-            return core
-        
-        # Group entries by their core representation
-        for entry in cleaned_names:
-            core = get_core_name(entry)
-            if core not in core_to_entries:
-                core_to_entries[core] = []
-            core_to_entries[core].append(entry)
-        
-        # For each core, pick the best entry (shortest, cleanest)
-        unique_names = []
-        for core, entries in core_to_entries.items():
-            if not entries:
-                continue
-                
-            # Sort by: 1) entries without "Diamond Class" first, 2) then by length
-            def entry_priority(entry):
-                has_diamond_class = 'Diamond Class' in entry
-                return (has_diamond_class, len(entry), entry)
-            
-            best_entry = sorted(entries, key=entry_priority)[0]
-            
-            # Clean up the best entry
-            cleaned = re.sub(r'\bNew\b', '', best_entry, flags=re.IGNORECASE).strip()
-            cleaned = re.sub(r'\bDiamond\s+Class\b', '', cleaned, flags=re.IGNORECASE).strip()
-            cleaned = re.sub(r'\s+', ' ', cleaned)
-            
-            if cleaned:  # Only add non-empty entries
-                unique_names.append(cleaned)
-        # Only keep entries that have a valid time range (start and end time)
-        final_names = []
-        for entry in unique_names:
-            # Accept time formats like 10am-2pm, 10.30am-2am, 10:30am-6pm, 10.30am -6pm, etc.
-            time_match = re.search(r'(\d{1,2}(?:[:\.]\d{2})? ?[ap]m\s*-\s*\d{1,2}(?:[:\.]\d{2})? ?[ap]m)', entry, re.IGNORECASE)
-            if time_match:
-                # Extract just the name and time, removing extra content
-                # Pattern: Name + Time, ignore everything after the time
-                name_time_pattern = r'^([A-Z][^0-9]*?)(\d{1,2}(?:[:\.]\d{2})? ?[ap]m\s*-\s*\d{1,2}(?:[:\.]\d{2})? ?[ap]m)'
-                name_time_match = re.match(name_time_pattern, entry, re.IGNORECASE)
-                
-                if name_time_match:
-                    name_part = name_time_match.group(1).strip()
-                    time_part = name_time_match.group(2).strip()
-                    
-                    # Clean up the name part - remove common extra content
-                    name_part = re.sub(r'\(PHOTO\)|\bDiamond\s+Class\b|\bNew\b', '', name_part, flags=re.IGNORECASE)
-                    name_part = re.sub(r'\(No Indian\)|\(No Korean\)', '', name_part, flags=re.IGNORECASE)
-                    name_part = re.sub(r'\s+', ' ', name_part).strip()
-                    
-                    # Combine clean name and time
-                    cleaned = f"{name_part} {time_part}"
-                    final_names.append(cleaned)
-                else:
-                    # Fallback: basic cleanup if pattern matching fails
-                    cleaned = re.sub(r'\(PHOTO\)|\bDiamond\s+Class\b|\bNew\b', '', entry, flags=re.IGNORECASE)
-                    cleaned = re.sub(r'\(No Indian\)|\(No Korean\)', '', cleaned, flags=re.IGNORECASE)
-                    # Remove content after time pattern that looks like extra info
-                    cleaned = re.sub(r'(\d{1,2}(?:[:\.]\d{2})? ?[ap]m)\s*[^\w]*.*$', r'\1', cleaned, flags=re.IGNORECASE)
-                    cleaned = re.sub(r'\s+', ' ', cleaned).strip()
-                    final_names.append(cleaned)
-        results.append({
-            'title': title or '479 Ginza Roster',
-            'names': final_names
-        })
-    return {
-        'title': 'Elizabeth',
-        'rosters': results,
-        'timestamp': now_sydney_iso()
-    }
+def fingerprint(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
 
-def save_latest_results(data, filename="latest_results.json"):
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+def fragment_fingerprint(soup, fragment_selector):
+    return fingerprint(''.join(str(node) for node in soup.select(fragment_selector)))
 
-def load_latest_results(filename="latest_results.json"):
-    if os.path.exists(filename):
-        with open(filename, "r", encoding="utf-8") as f:
-            return json.load(f)
-    return None
+def output_fingerprint(roster):
+    return fingerprint(json.dumps(roster, ensure_ascii=False, sort_keys=True))
 
-def scrape_data():
-    result = {
-        'no5': extract_no5_roster(),
-        'ginza': extract_ginza_roster(),
-        'ginza479': extract_479ginza_roster()
+def scrape_roster_page(venue):
+    # Fetch a venue's roster page and parse it, reusing the previous result when nothing changed
+    url = venue.url
+    cached = page_cache.get(url)
+    with MemoryTracker() as memory:
+        soup, source, validators, stats, fragment = fetch_soup(
+            url, venue.ready_selector, venue.fragment_selector, venue.strainer,
+            cached and cached['validators'], venue.fetch, cached and cached['fragment'])
+        extract_seconds = None
+        if soup is None:
+            # 304 Not Modified or an unchanged fragment: only possible with a cached result
+            roster, fragment = cached['roster'], fragment or cached['fragment']
+        else:
+            if cached and cached['fragment'] == fragment:
+                roster = cached['roster']
+            else:
+                started = time.perf_counter()
+                with stage('extract'):
+                    roster = venue.parse(soup, venue)
+                extract_seconds = round(time.perf_counter() - started, 4)
+    if stats is not None:
+        stats = dict(stats, extract_seconds=extract_seconds, peak_memory_bytes=memory.peak_bytes)
+        parse_stats[url] = stats
+        logger.info('%s parsed %d bytes via %s/%s in %.3fs, extracted in %ss',
+                    url, stats['bytes'], stats['method'], stats['parser'],
+                    stats['select_seconds'] + stats['parse_seconds'], extract_seconds)
+    output = output_fingerprint(roster)
+    now = now_sydney_iso()
+    if cached and cached['output'] == output:
+        status, changed_at = 'reused', cached['changed_at']
+    else:
+        status, changed_at = 'refreshed', now
+    page_cache[url] = {
+        'fragment': fragment,
+        'output': output,
+        'roster': roster,
+        'validators': validators,
+        'changed_at': changed_at,
     }
-    save_latest_results(result)
+    result = dict(roster)
+    # timestamp: when the page was read (today/tomorrow are relative to it); changed_at: when the roster last changed
+    result.update({'source': source, 'status': status, 'timestamp': now, 'changed_at': changed_at})
+    return result
+
+def parse_venue_html(key, html):
+    # Parse saved page HTML the same way a live scrape would, without fetching anything;
+    # returns (roster, stats) with the parse stats plus extract_seconds
+    venue = VENUES[key]
+    soup, stats = parse_roster_html(html, venue.fragment_selector, venue.strainer)
+    started = time.perf_counter()
+    roster = venue.parse(soup, venue)
+    return roster, dict(stats, extract_seconds=round(time.perf_counter() - started, 4))
+
+def save_latest_results(data, filename=RESULTS_PATH):
+    path = data_path(filename)
+    with stage('save', venue='all'), file_lock(path):
+        atomic_write_json(path, data)
+    if results_store.owns(path):
+        results_store.update(data)
+
+def load_latest_results(filename=RESULTS_PATH):
+    return read_json(data_path(filename))
+
+# Per-run bookkeeping that doesn't make a venue's published data different
+VOLATILE_KEYS = ('status', 'timestamp', 'changed_at')
+
+def roster_content(data):
+    if not isinstance(data, dict):
+        return data
+    return {k: v for k, v in data.items() if k not in VOLATILE_KEYS}
+
+def venue_content(data):
+    # What readers see; the same roster read on a later day covers different dates, so the day counts
+    content = roster_content(data)
+    if isinstance(content, dict):
+        content['scraped_on'] = (data.get('timestamp') or '')[:10]
+    return content
+
+def merge_venue(stored, fresh):
+    """``fresh`` as it should be published over ``stored`` (the venue's entry on disk).
+
+    ``reused`` only means unchanged since this process last scraped; if the file
+    holds something else (an error/stale entry, or another process's write) the
+    roster is new to readers, so it counts as changed by this scrape.
+    """
+    if fresh.get('status') == 'reused' and roster_content(stored) != roster_content(fresh):
+        fresh = dict(fresh, changed_at=fresh['timestamp'])
+    return fresh
+
+def results_differ(stored, result):
+    stored = stored or {}
+    return (set(stored) != set(result)
+            or any(venue_content(stored[key]) != venue_content(data) for key, data in result.items()))
+
+def record_last_scrape(venues):
+    # Heartbeat for monitoring: when each venue was last scraped and how it went
+    path = data_path(LAST_SCRAPE_PATH)
+    with file_lock(path):
+        last = read_json(path) or {}
+        last.setdefault('venues', {}).update(venues)
+        last['finished_at'] = now_sydney_iso()
+        atomic_write_json(path, last)
+
+def venue_failure(key, error, previous=None):
+    # Keep the last good data for a failed venue so the frontend still has something to show
+    if previous and key in previous:
+        result = dict(previous[key])
+        result['stale'] = True
+    else:
+        result = {'title': VENUES[key].title if key in VENUES else key}
+    result['error'] = error
+    result['error_timestamp'] = now_sydney_iso()
+    return result
+
+def run_venue(key, progress=None):
+    if progress:
+        progress(key, 'running')
+    venue = VENUES[key]
+    with venue_run(key) as run:
+        result = scrape_roster_page(venue)
+        run.status, run.source = result['status'], result['source']
+    if progress:
+        progress(key, 'done')
     return result
+
+def scrape_venues_concurrently(max_workers=None, deadline=None, progress=None):
+    max_workers = max_workers or SCRAPE_MAX_WORKERS
+    deadline = SCRAPE_DEADLINE if deadline is None else deadline
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(VENUES))),
+                                  thread_name_prefix='scrape')
+    futures = {key: executor.submit(run_venue, key, progress) for key in VENUES}
+    try:
+        wait(futures.values(), timeout=deadline)
+    finally:
+        # Don't wait for stragglers past the deadline; queued venues are cancelled
+        executor.shutdown(wait=False, cancel_futures=True)
+    results, errors = {}, {}
+    for key, future in futures.items():
+        if not future.done():
+            errors[key] = f'Timed out after {deadline:g}s'
+        elif future.cancelled():
+            errors[key] = 'Cancelled before start (deadline reached)'
+        elif future.exception() is not None:
+            exc = future.exception()
+            errors[key] = f'{type(exc).__name__}: {exc}'
+        else:
+            results[key] = future.result()
+    return results, errors
+
+def scrape_data(concurrent=True, max_workers=None, deadline=None, progress=None):
+    # progress, if given, is called as progress(venue_key, 'running'|'done'|'failed')
+    started_at, started = now_sydney_iso(), time.perf_counter()
+    if concurrent:
+        results, errors = scrape_venues_concurrently(max_workers, deadline, progress)
+    else:
+        results, errors = {}, {}
+        for key in VENUES:
+            try:
+                results[key] = run_venue(key, progress)
+            except Exception as exc:
+                errors[key] = f'{type(exc).__name__}: {exc}'
+    if progress:
+        for key in errors:
+            progress(key, 'failed')
+    with _save_lock, file_lock(RESULTS_PATH):
+        previous = load_latest_results() or {}
+        result = {}
+        for key in VENUES:
+            if key in results:
+                result[key] = merge_venue(previous.get(key), results[key])
+            else:
+                result[key] = venue_failure(key, errors[key], previous)
+        # Only persist if what readers would see differs from the file
+        if results_differ(previous, result):
+            save_latest_results(result)
+    record_last_scrape({key: data.get('status', 'failed') if key in results else 'failed'
+                        for key, data in result.items()})
+    record_history(results, scraped_at=started_at)
+    log_scrape_run(started_at, time.perf_counter() - started, VENUES, errors)
+    return result
+
+def scrape_venue(key):
+    # Scrape one venue and merge it into the latest results; extractor errors propagate
+    started_at, started = now_sydney_iso(), time.perf_counter()
+    try:
+        venue_result = run_venue(key)
+    finally:
+        log_scrape_run(started_at, time.perf_counter() - started, [key])
+    with _save_lock, file_lock(RESULTS_PATH):
+        result = load_latest_results() or {}
+        venue_result = merge_venue(result.get(key), venue_result)
+        if venue_content(result.get(key)) != venue_content(venue_result):
+            result[key] = venue_result
+            save_latest_results(result)
+    record_last_scrape({key: venue_result['status']})
+    record_history({key: venue_result}, scraped_at=started_at)
+    return venue_result
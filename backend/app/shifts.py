@@ -0,0 +1,133 @@
+from array import array
+from .database import venue_entries
+from .normalize import TIME_RANGE_RE
+from .results_store import results_store
+import datetime
+import bisect
+import re
+
+DAY_MINUTES = 24 * 60
+
+# "10am", "10.30am", "10:30 am", "18:00"
+CLOCK_RE = re.compile(r'^\s*(\d{1,2})(?:[:\.](\d{2}))?\s*([ap]m)?\s*$', re.IGNORECASE)
+
+def parse_clock(text):
+    """Minutes after midnight for a 12-hour ("10.30am", "12am") or 24-hour ("18:00") time."""
+    match = CLOCK_RE.match(text or '')
+    if not match:
+        raise ValueError(f'Unrecognised time {text!r}')
+    hour, minute, meridiem = int(match.group(1)), int(match.group(2) or 0), match.group(3)
+    if meridiem:
+        if not 1 <= hour <= 12:
+            raise ValueError(f'Unrecognised time {text!r}')
+        hour = hour % 12 + (12 if meridiem.lower() == 'pm' else 0)
+    elif hour == 24 and minute == 0:
+        return DAY_MINUTES
+    if hour > 23 or minute > 59:
+        raise ValueError(f'Unrecognised time {text!r}')
+    return hour * 60 + minute
+
+def parse_shift(text):
+    # "10.30am-2am" -> (630, 1560): the end wraps past midnight into the next day
+    match = TIME_RANGE_RE.search(text or '')
+    if not match:
+        return None
+    try:
+        start, end = parse_clock(match.group(1)), parse_clock(match.group(2))
+    except ValueError:
+        return None  # e.g. "13pm"; leave it out of the index rather than fail the snapshot
+    if end <= start:
+        end += DAY_MINUTES
+    return start, end
+
+def format_minutes(minutes):
+    return f'{minutes // 60 % 24:02d}:{minutes % 60:02d}'
+
+class Shift:
+    """One roster entry: minutes from the roster day's midnight, ``end > start``."""
+
+    __slots__ = ('name', 'start', 'end', 'text')
+
+    def __init__(self, name, start, end, text):
+        self.name = name
+        self.start = start
+        self.end = end
+        self.text = text
+
+class DayIndex:
+    """A venue's shifts for one roster day, sorted by start.
+
+    Shifts are at most a day long, so everything overlapping ``[lo, hi)`` starts
+    in ``(lo - max_length, hi)``: two bisects over the ``starts`` array bound the
+    scan to the shifts that can actually match.
+    """
+
+    __slots__ = ('venue', 'date', 'shifts', 'starts', 'max_length')
+
+    def __init__(self, venue, date, shifts):
+        self.venue = venue
+        self.date = date
+        self.shifts = sorted(shifts, key=lambda shift: (shift.start, shift.end))
+        self.starts = array('H', (shift.start for shift in self.shifts))
+        self.max_length = max((shift.end - shift.start for shift in self.shifts), default=0)
+
+    def overlapping(self, lo, hi):
+        first = bisect.bisect_right(self.starts, lo - self.max_length)
+        last = bisect.bisect_left(self.starts, hi)
+        return [shift for shift in self.shifts[first:last] if shift.end > lo]
+
+class ShiftIndex:
+    """Interval index over the current results, rebuilt once per new snapshot
+    (at scrape time, or when another worker's write is picked up) instead of
+    every client re-parsing the roster strings."""
+
+    def __init__(self):
+        self._days = {}  # roster date -> [DayIndex per venue]
+
+    def rebuild(self, results):
+        grouped = {}
+        for venue, data in (results or {}).items():
+            if not isinstance(data, dict):
+                continue
+            for roster_date, name, text in venue_entries(data):
+                parsed = parse_shift(text)
+                if parsed:
+                    grouped.setdefault((roster_date, venue), []).append(Shift(name, *parsed, text))
+        days = {}
+        for (roster_date, venue), shifts in grouped.items():
+            days.setdefault(roster_date, []).append(DayIndex(venue, roster_date, shifts))
+        self._days = days  # swapped in whole; readers never see a half-built index
+
+    def between(self, roster_date, lo, hi, venue=None):
+        """Shifts on ``roster_date`` overlapping minutes ``[lo, hi)`` of that day.
+
+        Shifts from the previous day that run past midnight are included too.
+        """
+        days = self._days
+        previous = (datetime.date.fromisoformat(roster_date) - datetime.timedelta(days=1)).isoformat()
+        matches = []
+        for day, offset in ((previous, DAY_MINUTES), (roster_date, 0)):
+            for index in days.get(day, ()):
+                if venue is None or index.venue == venue:
+                    matches.extend((index, shift) for shift in index.overlapping(lo + offset, hi + offset))
+        return [shift_record(index, shift) for index, shift in matches]
+
+    def on_at(self, moment, venue=None):
+        minute = moment.hour * 60 + moment.minute
+        return self.between(moment.date().isoformat(), minute, minute + 1, venue)
+
+def shift_record(index, shift):
+    return {
+        'venue': index.venue,
+        'date': index.date,
+        'name': shift.name,
+        'shift': shift.text,
+        'start': format_minutes(shift.start),
+        'end': format_minutes(shift.end),
+        'start_minute': shift.start,
+        'end_minute': shift.end,
+        'overnight': shift.end > DAY_MINUTES,
+    }
+
+shift_index = ShiftIndex()
+results_store.add_listener(shift_index.rebuild)
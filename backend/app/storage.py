@@ -0,0 +1,77 @@
+from contextlib import contextmanager
+import threading
+import tempfile
+import json
+import os
+
+try:
+    import fcntl
+except ImportError:  # Windows dev boxes: fall back to in-process locking only
+    fcntl = None
+
+# Everything the backend persists lives here, whatever directory uvicorn was started from
+DATA_DIR = os.environ.get(
+    'SCRAPER_DATA_DIR', os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+RESULTS_PATH = os.path.join(DATA_DIR, 'latest_results.json')
+# Rewritten after every scrape, even when the results didn't change (for monitoring)
+LAST_SCRAPE_PATH = os.path.join(DATA_DIR, 'last_scrape.json')
+
+# Lock paths held by the current thread, so nested file_lock() calls don't self-deadlock
+_held_locks = threading.local()
+
+def data_path(filename):
+    return filename if os.path.isabs(filename) else os.path.join(DATA_DIR, filename)
+
+@contextmanager
+def file_lock(path):
+    """Exclusive inter-process lock on ``path + '.lock'`` (the data file itself is
+    replaced on every write, so it can't carry the lock). Re-entrant per thread."""
+    held = getattr(_held_locks, 'paths', None)
+    if held is None:
+        held = _held_locks.paths = set()
+    key = os.path.abspath(path)
+    if fcntl is None or key in held:
+        yield
+        return
+    with open(path + '.lock', 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        held.add(key)
+        try:
+            yield
+        finally:
+            held.discard(key)
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def atomic_write_json(path, data):
+    """Write compact JSON to a temp file in the same directory, fsync it and
+    rename it over ``path``: readers see either the old or the new file, never
+    a partial one, even if the process dies mid-write."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+    try:
+        os.chmod(tmp_path, 0o644)  # mkstemp creates 0600; keep the file readable as before
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    if hasattr(os, 'O_DIRECTORY'):
+        # Make the rename itself durable
+        dir_fd = os.open(directory, os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+def read_json(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
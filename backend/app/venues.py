@@ -0,0 +1,90 @@
+from .extractors import EXTRACTORS
+
+FETCH_STRATEGIES = ('auto', 'http', 'browser')
+
+class Venue:
+    """Declaration of one roster site.
+
+    ``extractor`` names a strategy in ``extractors.EXTRACTORS`` (or is a
+    callable ``parse(soup, venue)``). ``fetch`` is 'auto' (plain HTTP, Chrome
+    only if the roster isn't in the HTML), 'http' or 'browser'.
+    ``ready_selector`` must match once the roster has rendered and
+    ``fragment_selector`` covers everything the extractor reads, and
+    ``strainer`` names its SoupStrainer equivalent in ``parsing.STRAINERS``.
+    ``rules`` names the normalization rule table (defaults to the key) and
+    ``interval`` is the default scheduler cadence in seconds.
+    """
+
+    def __init__(self, key, title, url, extractor, ready_selector, fragment_selector,
+                 strainer=None, fetch='auto', rules=None, block_title=None, interval=None):
+        if fetch not in FETCH_STRATEGIES:
+            raise ValueError(f'Unknown fetch strategy {fetch!r} for venue {key!r}')
+        self.key = key
+        self.title = title
+        self.url = url
+        self.parse = EXTRACTORS[extractor] if isinstance(extractor, str) else extractor
+        self.ready_selector = ready_selector
+        self.fragment_selector = fragment_selector
+        self._strainer = strainer
+        self.fetch = fetch
+        self.rules = rules or key
+        self.block_title = block_title or f'{title} Roster'
+        self.interval = interval
+
+    @property
+    def strainer(self):
+        # Resolved on first use: serving-only processes never import the parsing stack
+        if isinstance(self._strainer, str):
+            from .parsing import STRAINERS
+            self._strainer = STRAINERS[self._strainer]
+        return self._strainer
+
+    def __repr__(self):
+        return f'Venue({self.key!r}, {self.url!r})'
+
+# Venue key -> Venue, in the order results are returned
+VENUES = {}
+
+def register(venue):
+    if venue.key in VENUES:
+        raise ValueError(f'Venue {venue.key!r} is already registered')
+    VENUES[venue.key] = venue
+    return venue
+
+def get_venue(key):
+    return VENUES.get(key)
+
+GINZA_READY_SELECTOR = 'div.clearfix[style*="margin-bottom: 20px"] p'
+GINZA_FRAGMENT_SELECTOR = 'div.clearfix[style*="margin-bottom: 20px"]'
+
+register(Venue(
+    key='no5',
+    title='Marrickville',
+    url='https://no5marrickville.com/#roster',
+    extractor='timetable',
+    ready_selector='div#nav-rostertoday .timetable__row, div#nav-rostertomorrow .timetable__row',
+    fragment_selector='div#nav-rostertoday, div#nav-rostertomorrow',
+    strainer='no5',
+))
+
+register(Venue(
+    key='ginza',
+    title='Cleveland',
+    url='https://www.ginzaclub.com.au/Roster',
+    extractor='ginza-blocks',
+    ready_selector=GINZA_READY_SELECTOR,
+    fragment_selector=GINZA_FRAGMENT_SELECTOR,
+    strainer='ginza',
+    block_title='Ginza Roster',
+))
+
+register(Venue(
+    key='ginza479',
+    title='Elizabeth',
+    url='https://www.479ginza.com.au/Roster',
+    extractor='ginza479-blocks',
+    ready_selector=GINZA_READY_SELECTOR,
+    fragment_selector=GINZA_FRAGMENT_SELECTOR,
+    strainer='ginza',
+    block_title='479 Ginza Roster',
+))
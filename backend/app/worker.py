@@ -0,0 +1,51 @@
+"""Standalone scraper process, so API workers can stay serve-only.
+
+Run from backend/:
+    python -m app.worker          # run the per-venue scheduler until SIGINT/SIGTERM
+    python -m app.worker --once   # scrape every venue once and exit (e.g. from cron)
+
+Results go to the same latest_results.json (under its file lock); API workers
+pick new snapshots up on their next request without importing any of this.
+"""
+from .scraper import scrape_data
+from .scheduler import create_scheduler
+from .browser_pool import shutdown_pool
+from .fetch import close_session
+from .database import roster_history
+from .jobs import job_manager
+import argparse
+import asyncio
+import logging
+import signal
+
+async def run_scheduler():
+    scheduler = create_scheduler()
+    scheduler.start()
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopping.set)
+    await stopping.wait()
+    await scheduler.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--once', action='store_true', help='scrape every venue once and exit')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    try:
+        if args.once:
+            results = scrape_data()
+            failed = [key for key, data in results.items() if data.get('error')]
+            if failed:
+                raise SystemExit(f'Scrape failed for: {", ".join(failed)}')
+        else:
+            asyncio.run(run_scheduler())
+    finally:
+        job_manager.shutdown()
+        shutdown_pool()
+        close_session()
+        roster_history.close()
+
+if __name__ == '__main__':
+    main()
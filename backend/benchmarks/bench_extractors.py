@@ -0,0 +1,118 @@
+"""Offline benchmark and regression check for the venue extractors.
+
+Run from backend/:  python -m benchmarks.bench_extractors [--update-golden]
+
+For every saved page in fixtures/<venue>/*.html this reports parse and
+extract time and compares the output with the golden fixtures/<venue>/*.json,
+then measures throughput on large synthetic Ginza-style rosters. Exits with
+status 1 if any fixture's output differs from its golden file.
+"""
+import argparse
+import difflib
+import random
+import json
+import glob
+import sys
+import os
+
+from app.parsing import HTML_PARSER
+from app.scraper import parse_venue_html
+from app.venues import VENUES
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'fixtures')
+
+def run_page(venue, html, repeat=1):
+    # Best of ``repeat`` runs of the scraper's own offline parse path, per step
+    parse_seconds = extract_seconds = float('inf')
+    for _ in range(max(1, repeat)):
+        roster, stats = parse_venue_html(venue, html)
+        parse_seconds = min(parse_seconds, stats['select_seconds'] + stats['parse_seconds'])
+        extract_seconds = min(extract_seconds, stats['extract_seconds'])
+    return roster, stats, parse_seconds, extract_seconds
+
+def golden_diff(expected, actual):
+    def dump(data):
+        return json.dumps(data, ensure_ascii=False, indent=2).splitlines()
+    return '\n'.join(difflib.unified_diff(dump(expected), dump(actual), 'golden', 'actual', lineterm=''))
+
+def check_fixtures(repeat, update_golden):
+    failures = 0
+    for venue in VENUES:
+        for page in sorted(glob.glob(os.path.join(FIXTURES_DIR, venue, '*.html'))):
+            with open(page, encoding='utf-8') as f:
+                html = f.read()
+            roster, stats, parse_seconds, extract_seconds = run_page(venue, html, repeat)
+            golden_path = page[:-len('.html')] + '.json'
+            name = os.path.relpath(page, FIXTURES_DIR)
+            if update_golden:
+                with open(golden_path, 'w', encoding='utf-8') as f:
+                    json.dump(roster, f, ensure_ascii=False, indent=2)
+                    f.write('\n')
+                verdict = 'updated'
+            elif not os.path.exists(golden_path):
+                verdict = 'NO GOLDEN'
+                failures += 1
+            else:
+                with open(golden_path, encoding='utf-8') as f:
+                    expected = json.load(f)
+                diff = golden_diff(expected, roster)
+                verdict = 'ok' if not diff else 'DIFF'
+                if diff:
+                    failures += 1
+                    print(diff)
+            print(f'{name:45s} {stats["method"]:10s} parse {parse_seconds * 1000:7.2f} ms   '
+                  f'extract {extract_seconds * 1000:7.2f} ms   {verdict}')
+    return failures
+
+def synthetic_ginza_page(rng, blocks, entries_per_block):
+    names = ['Yumi', 'Sachi', 'Miumiu', 'Ami', 'Dolly', 'Kanna', 'Nana', 'Hana', 'Rei', 'Momo']
+    times = ['10am-6pm', '10.30am-12am', '12pm-2am', '6pm-2am', '10:30am-10:30pm', '1pm-4am']
+    parts = ['<html><body><div class="container">']
+    for b in range(blocks):
+        parts.append(f'<div class="clearfix" style="margin-bottom: 20px;"><h3><strong>Day {b}</strong></h3><div class="info">')
+        for i in range(entries_per_block):
+            name = f'{rng.choice("JTSV")} {rng.choice(names)}{i}'
+            when = rng.choice(times)
+            roll = rng.random()
+            if roll < 0.4:
+                parts.append(f'<p><span>{name}</span> <span>{when}</span></p>')
+            elif roll < 0.6:
+                parts.append(f'<p><span>{name}</span><span>{when}</span><span>{when}</span></p>')
+            elif roll < 0.8:
+                parts.append(f'<p>{name} New {when} Diamond Class</p>')
+            else:
+                parts.append(f'<p>{name} {when}</p>')
+        parts.append('</div></div>')
+        # Unrelated markup the parsers should skip
+        parts.append('<div class="promo"><p>Special 10am-2pm</p></div>' * 5)
+    parts.append('</div></body></html>')
+    return ''.join(parts)
+
+def synthetic_throughput(blocks, entries_per_block, repeat):
+    html = synthetic_ginza_page(random.Random(1), blocks, entries_per_block)
+    total = blocks * entries_per_block
+    print(f'\nSynthetic roster: {blocks} blocks x {entries_per_block} entries, {len(html) / 1024:.0f} KiB')
+    for venue in ('ginza', 'ginza479'):
+        roster, _, parse_seconds, extract_seconds = run_page(venue, html, repeat)
+        parsed = sum(len(r['names']) for r in roster['rosters'])
+        elapsed = parse_seconds + extract_seconds
+        print(f'{venue:9s} parse {parse_seconds * 1000:8.1f} ms   extract {extract_seconds * 1000:8.1f} ms   '
+              f'{total / elapsed:>9,.0f} raw entries/s   ({parsed} entries out)')
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--update-golden', action='store_true', help='rewrite the golden JSON files')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--blocks', type=int, default=20)
+    parser.add_argument('--entries', type=int, default=200, help='entries per synthetic block')
+    args = parser.parse_args()
+
+    print(f'HTML parser: {HTML_PARSER}\n')
+    failures = check_fixtures(args.repeat, args.update_golden)
+    synthetic_throughput(args.blocks, args.entries, args.repeat)
+    if failures:
+        print(f'\n{failures} fixture(s) differ from their golden output')
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,255 @@
+"""Micro-benchmark: Ginza roster-entry normalization, current engine vs the
+inline pipeline it replaced.
+
+Run from backend/:  python -m benchmarks.bench_normalize [--entries N] [--repeat R]
+
+Prints entries/second for both and how many roster blocks produce different
+output, ignoring spacing around the time-range dash. That spacing is now
+normalized for every venue: the legacy Ginza pipeline only tightened dotted
+times, so colon times change too ('S Nana 10:30am - 7:30pm' becomes
+'S Nana 10:30am-7:30pm'). The legacy implementation below is kept verbatim
+(minus the surrounding DOM walking) as the baseline.
+"""
+import argparse
+import random
+import time
+import re
+
+from app.normalize import normalize_names
+
+
+def legacy_normalize_ginza(names):
+    # Remove repeated phrases within a single entry
+    def remove_internal_repeats(s):
+        # If a phrase is repeated immediately, keep only one
+        words = s.strip().split()
+        n = len(words)
+        for size in range(3, min(10, n//2+1)):
+            for i in range(n - 2*size + 1):
+                if words[i:i+size] == words[i+size:i+2*size]:
+                    # Remove the repeated block
+                    return ' '.join(words[:i+size])
+        return s
+    cleaned_names = [remove_internal_repeats(n) for n in names]
+
+    # Enhanced deduplication: prefer entries without "Diamond Class" when duplicates exist
+    # Group entries by their core name+time (without Diamond Class)
+    core_to_entries = {}
+
+    def get_core_name(s):
+        # Remove "Diamond Class", "New", and clean up spacing
+        core = re.sub(r'\bNew\b', '', s, flags=re.IGNORECASE).strip()
+        core = re.sub(r'\bDiamond\s+Class\b', '', core, flags=re.IGNORECASE).strip()
+        core = re.sub(r'\s+', ' ', core)
+        return core
+
+    # Group entries by their core representation
+    for entry in cleaned_names:
+        core = get_core_name(entry)
+        if core not in core_to_entries:
+            core_to_entries[core] = []
+        core_to_entries[core].append(entry)
+
+    # For each core, pick the best entry (shortest, cleanest)
+    unique_names = []
+    for core, entries in core_to_entries.items():
+        if not entries:
+            continue
+
+        # Sort by: 1) entries without "Diamond Class" first, 2) then by length
+        def entry_priority(entry):
+            has_diamond_class = 'Diamond Class' in entry
+            return (has_diamond_class, len(entry), entry)
+
+        best_entry = sorted(entries, key=entry_priority)[0]
+
+        # Clean up the best entry
+        cleaned = re.sub(r'\bNew\b', '', best_entry, flags=re.IGNORECASE).strip()
+        cleaned = re.sub(r'\bDiamond\s+Class\b', '', cleaned, flags=re.IGNORECASE).strip()
+        cleaned = re.sub(r'\s+', ' ', cleaned)
+
+        if cleaned:  # Only add non-empty entries
+            unique_names.append(cleaned)
+
+    # Only keep entries that have a valid time range (start and end time)
+    final_names = []
+    for entry in unique_names:
+        # Accept time formats like 10am-2pm, 10.30am-2am, 10:30am-6pm, 10.30am-6pm, etc.
+        time_match = re.search(r'(\d{1,2}(?:[:\.]\d{2})? ?[ap]m\s*-\s*\d{1,2}(?:[:\.]\d{2})? ?[ap]m)', entry, re.IGNORECASE)
+        if time_match:
+            # Extract just the name and time, removing extra content
+            # Pattern: Name + Time, ignore everything after the time
+            name_time_pattern = r'^([A-Z][^0-9]*?)(\d{1,2}(?:[:\.]\d{2})? ?[ap]m\s*-\s*\d{1,2}(?:[:\.]\d{2})? ?[ap]m)'
+            name_time_match = re.match(name_time_pattern, entry, re.IGNORECASE)
+
+            if name_time_match:
+                name_part = name_time_match.group(1).strip()
+                time_part = name_time_match.group(2).strip()
+
+                # Clean up the name part
+                name_part = re.sub(r'\(PHOTO\)|\bDiamond\s+Class\b|\bNew\b', '', name_part, flags=re.IGNORECASE)
+                name_part = re.sub(r'\s+', ' ', name_part).strip()
+
+                # Normalize time format (remove spaces around dash) BEFORE adding to final_names
+                time_part = re.sub(r'(\d+\.?\d*[ap]m)\s*-\s*(\d+\.?\d*[ap]m)', r'\1-\2', time_part, flags=re.IGNORECASE)
+
+                # Combine clean name and time
+                cleaned = f"{name_part} {time_part}"
+                final_names.append(cleaned)
+            else:
+                # Fallback: basic cleanup if pattern matching fails
+                cleaned = re.sub(r'\(PHOTO\)|\bDiamond\s+Class\b|\bNew\b', '', entry, flags=re.IGNORECASE)
+                # Remove content after time pattern that looks like extra info
+                cleaned = re.sub(r'(\d{1,2}(?:[:\.]\d{2})? ?[ap]m)\s*[^\w]*.*$', r'\1', cleaned, flags=re.IGNORECASE)
+                # Normalize time spacing BEFORE adding to final_names
+                cleaned = re.sub(r'(\d+\.?\d*[ap]m)\s*-\s*(\d+\.?\d*[ap]m)', r'\1-\2', cleaned, flags=re.IGNORECASE)
+                cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+                final_names.append(cleaned)
+
+    # Final deduplication step - remove exact duplicates that may have slipped through
+    final_names = list(dict.fromkeys(final_names))  # Preserves order while removing duplicates
+    return final_names
+
+def legacy_normalize_479ginza(names):
+    # Remove repeated phrases within a single entry
+    def remove_internal_repeats(s):
+        # If a phrase is repeated immediately, keep only one
+        words = s.strip().split()
+        n = len(words)
+        for size in range(3, min(10, n//2+1)):
+            for i in range(n - 2*size + 1):
+                if words[i:i+size] == words[i+size:i+2*size]:
+                    # Remove the repeated block
+                    return ' '.join(words[:i+size])
+        return s
+    cleaned_names = [remove_internal_repeats(n) for n in names]
+
+    # Enhanced deduplication: prefer entries without "Diamond Class" when duplicates exist
+    # Group entries by their core name+time (without Diamond Class)
+    core_to_entries = {}
+
+    def get_core_name(s):
+        # Remove "Diamond Class", "New", and clean up spacing
+        core = re.sub(r'\bNew\b', '', s, flags=re.IGNORECASE).strip()
+        core = re.sub(r'\bDiamond\s+Class\b', '', core, flags=re.IGNORECASE).strip()
+        core = re.sub(r'\s+', ' ', core)
+        return core
+
+    # Group entries by their core representation
+    for entry in cleaned_names:
+        core = get_core_name(entry)
+        if core not in core_to_entries:
+            core_to_entries[core] = []
+        core_to_entries[core].append(entry)
+
+    # For each core, pick the best entry (shortest, cleanest)
+    unique_names = []
+    for core, entries in core_to_entries.items():
+        if not entries:
+            continue
+
+        # Sort by: 1) entries without "Diamond Class" first, 2) then by length
+        def entry_priority(entry):
+            has_diamond_class = 'Diamond Class' in entry
+            return (has_diamond_class, len(entry), entry)
+
+        best_entry = sorted(entries, key=entry_priority)[0]
+
+        # Clean up the best entry
+        cleaned = re.sub(r'\bNew\b', '', best_entry, flags=re.IGNORECASE).strip()
+        cleaned = re.sub(r'\bDiamond\s+Class\b', '', cleaned, flags=re.IGNORECASE).strip()
+        cleaned = re.sub(r'\s+', ' ', cleaned)
+
+        if cleaned:  # Only add non-empty entries
+            unique_names.append(cleaned)
+    # Only keep entries that have a valid time range (start and end time)
+    final_names = []
+    for entry in unique_names:
+        # Accept time formats like 10am-2pm, 10.30am-2am, 10:30am-6pm, 10.30am -6pm, etc.
+        time_match = re.search(r'(\d{1,2}(?:[:\.]\d{2})? ?[ap]m\s*-\s*\d{1,2}(?:[:\.]\d{2})? ?[ap]m)', entry, re.IGNORECASE)
+        if time_match:
+            # Extract just the name and time, removing extra content
+            # Pattern: Name + Time, ignore everything after the time
+            name_time_pattern = r'^([A-Z][^0-9]*?)(\d{1,2}(?:[:\.]\d{2})? ?[ap]m\s*-\s*\d{1,2}(?:[:\.]\d{2})? ?[ap]m)'
+            name_time_match = re.match(name_time_pattern, entry, re.IGNORECASE)
+
+            if name_time_match:
+                name_part = name_time_match.group(1).strip()
+                time_part = name_time_match.group(2).strip()
+
+                # Clean up the name part - remove common extra content
+                name_part = re.sub(r'\(PHOTO\)|\bDiamond\s+Class\b|\bNew\b', '', name_part, flags=re.IGNORECASE)
+                name_part = re.sub(r'\(No Indian\)|\(No Korean\)', '', name_part, flags=re.IGNORECASE)
+                name_part = re.sub(r'\s+', ' ', name_part).strip()
+
+                # Combine clean name and time
+                cleaned = f"{name_part} {time_part}"
+                final_names.append(cleaned)
+            else:
+                # Fallback: basic cleanup if pattern matching fails
+                cleaned = re.sub(r'\(PHOTO\)|\bDiamond\s+Class\b|\bNew\b', '', entry, flags=re.IGNORECASE)
+                cleaned = re.sub(r'\(No Indian\)|\(No Korean\)', '', cleaned, flags=re.IGNORECASE)
+                # Remove content after time pattern that looks like extra info
+                cleaned = re.sub(r'(\d{1,2}(?:[:\.]\d{2})? ?[ap]m)\s*[^\w]*.*$', r'\1', cleaned, flags=re.IGNORECASE)
+                cleaned = re.sub(r'\s+', ' ', cleaned).strip()
+                final_names.append(cleaned)
+    return final_names
+
+LEGACY = {
+    'ginza': legacy_normalize_ginza,
+    'ginza479': legacy_normalize_479ginza,
+}
+
+NAMES = ['Yumi', 'Sachi', 'Miumiu', 'Ami', 'Dolly', 'Orange', 'Akiko', 'Aqua', 'Nicole', 'Kitty', 'Fiona', 'Rei']
+TIMES = ['10am-6pm', '10.30am-12am', '12pm-2am', '6pm-2am', '10:30am-10:30pm', '1pm-4am', '10am - 6pm', '11.30am -7pm']
+BADGES = ['', '', '', ' New', ' Diamond Class', ' (PHOTO)', ' (No Korean)', ' (No Indian)']
+
+def synthetic_block(rng, size):
+    # Raw entries as the extractors collect them: badges, duplicates, repeated phrases, noise
+    entries = []
+    for _ in range(size):
+        entry = f"{rng.choice('JTSV')} {rng.choice(NAMES)}{rng.choice(BADGES)} {rng.choice(TIMES)}"
+        roll = rng.random()
+        if roll < 0.15:
+            entry = f'{entry} {entry}'
+        elif roll < 0.25:
+            entry = f'{entry} Diamond Class'
+        elif roll < 0.3:
+            entry = rng.choice(['(PHOTO)', 'Available today', 'Diamond Class'])
+        entries.append(entry)
+    return entries
+
+def canonical(names):
+    # The engine always renders "start-end"; the old 479 pipeline kept the page's dash spacing
+    return [re.sub(r'\s*-\s*', '-', name) for name in names]
+
+def bench(fn, blocks, venue, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for block in blocks:
+            fn(block, venue) if venue else fn(block)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--entries', type=int, default=20000, help='raw entries per venue')
+    parser.add_argument('--block-size', type=int, default=40)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    blocks = [synthetic_block(rng, args.block_size) for _ in range(max(1, args.entries // args.block_size))]
+    total = len(blocks) * args.block_size
+    for venue, legacy in LEGACY.items():
+        old = bench(legacy, blocks, None, args.repeat)
+        new = bench(normalize_names, blocks, venue, args.repeat)
+        diffs = sum(canonical(legacy(block)) != normalize_names(block, venue) for block in blocks)
+        print(f'{venue:9s} legacy {total / old:>10,.0f} entries/s   '
+              f'engine {total / new:>10,.0f} entries/s   '
+              f'speedup {old / new:4.1f}x   differing blocks {diffs}/{len(blocks)}')
+
+if __name__ == '__main__':
+    main()
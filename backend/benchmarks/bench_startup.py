@@ -0,0 +1,49 @@
+"""Startup time and memory of the API process versus the scraping stack.
+
+Run from backend/:  python -m benchmarks.bench_startup [--repeat N]
+
+Each module is imported in a fresh interpreter; this reports the median
+import time, the peak RSS of that interpreter and which heavy scraping
+dependencies ended up loaded. ``app.main`` is what every uvicorn worker
+pays at startup; ``app.scraper`` is only imported by workers that scrape.
+"""
+import statistics
+import subprocess
+import argparse
+import json
+import sys
+
+MODULES = ['fastapi', 'app.main', 'app.scraper']
+HEAVY = ['selenium', 'webdriver_manager', 'bs4', 'requests', 'lxml', 'selectolax']
+
+PROBE = """
+import resource, json, time, sys
+started = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - started
+print(json.dumps({{
+    'seconds': seconds,
+    'max_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'loaded': [name for name in {heavy!r} if name in sys.modules],
+}}))
+"""
+
+def probe(module):
+    output = subprocess.run([sys.executable, '-c', PROBE.format(module=module, heavy=HEAVY)],
+                            check=True, capture_output=True, text=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    for module in MODULES:
+        runs = [probe(module) for _ in range(max(1, args.repeat))]
+        seconds = statistics.median(run['seconds'] for run in runs)
+        rss_mb = statistics.median(run['max_rss_kb'] for run in runs) / 1024
+        loaded = ', '.join(runs[0]['loaded']) or '-'
+        print(f'{module:<12}  import {seconds * 1000:7.1f} ms   peak RSS {rss_mb:6.1f} MB   heavy deps: {loaded}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,15 @@
+from fastapi.testclient import TestClient
+
+from app import scraper
+from app.main import app
+
+
+def test_failed_venue_scrape_returns_the_job_error(monkeypatch):
+    def failing_scrape(key):
+        raise RuntimeError('site down')
+
+    monkeypatch.setattr(scraper, 'scrape_venue', failing_scrape)
+    response = TestClient(app).get('/scrape/no5')
+
+    assert response.status_code == 500
+    assert response.json() == {'detail': 'RuntimeError: site down'}
@@ -0,0 +1,26 @@
+import threading
+import time
+
+from app import browser_pool
+
+
+def test_chromedriver_is_resolved_once_by_concurrent_launches(monkeypatch):
+    installs = []
+
+    class FakeManager:
+        def install(self):
+            installs.append(threading.current_thread().name)
+            time.sleep(0.1)
+            return '/drivers/chromedriver'
+
+    monkeypatch.setattr(browser_pool, 'ChromeDriverManager', FakeManager)
+    monkeypatch.setattr(browser_pool, '_chromedriver_path', None)
+    paths = []
+    threads = [threading.Thread(target=lambda: paths.append(browser_pool.chromedriver_path())) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(installs) == 1
+    assert paths == ['/drivers/chromedriver'] * 5
@@ -0,0 +1,48 @@
+import asyncio
+import time
+
+from app import scraper
+from app.scheduler import Scheduler
+
+
+def run_scheduler(scheduler, seconds):
+    async def run():
+        scheduler.start()
+        await asyncio.sleep(seconds)
+        await scheduler.stop()
+    asyncio.run(run())
+
+
+def test_backoff_starts_at_the_interval_and_is_capped():
+    scheduler = Scheduler({'no5': 100}, retry_max=500)
+    venue = scheduler.venues['no5']
+    delays = []
+    for venue.failures in range(1, 5):
+        delays.append(scheduler._backoff(venue))
+    assert delays == [200, 400, 500, 500]
+
+
+def test_backoff_is_never_shorter_than_the_interval():
+    scheduler = Scheduler({'no5': 100}, retry_max=10)
+    venue = scheduler.venues['no5']
+    venue.failures = 3
+    assert scheduler._backoff(venue) == 100
+
+
+def test_failed_run_is_retried_after_its_backoff(monkeypatch):
+    attempts = []
+
+    def failing_scrape(key):
+        attempts.append(time.monotonic())
+        time.sleep(0.2)
+        raise RuntimeError('site down')
+
+    monkeypatch.setattr(scraper, 'scrape_venue', failing_scrape)
+    # The first failure ends 0.2s in and backs off min(0.5 * 2, 1.0) = 1s; the
+    # loop has to pick that up when the run finishes, not on its next tick
+    scheduler = Scheduler({'no5': 0.5}, jitter=0, retry_max=1.0)
+    run_scheduler(scheduler, 1.8)
+
+    assert len(attempts) == 2
+    assert 1.1 <= attempts[1] - attempts[0] <= 1.5
+    assert scheduler.venues['no5'].failures == 2
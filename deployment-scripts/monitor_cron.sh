@@ -64,24 +64,30 @@ if [ -f /srv/sydneyscheduler/backend/latest_results.json ]; then
     echo "Results file found:"
     ls -la /srv/sydneyscheduler/backend/latest_results.json
     echo ""
-    echo "Last modified: $(stat -c %y /srv/sydneyscheduler/backend/latest_results.json)"
+    # Only rewritten when a roster changes, so an old file is not a problem by itself
+    echo "Last changed: $(stat -c %y /srv/sydneyscheduler/backend/latest_results.json)"
     echo ""
     echo "File size: $(du -h /srv/sydneyscheduler/backend/latest_results.json | cut -f1)"
     echo ""
-    
-    # Check if file was updated recently
-    LAST_MODIFIED=$(stat -c %Y /srv/sydneyscheduler/backend/latest_results.json)
+else
+    echo "❌ Results file not found"
+fi
+
+# last_scrape.json is rewritten after every scrape, changed or not
+if [ -f /srv/sydneyscheduler/backend/last_scrape.json ]; then
+    echo "Last scrape: $(jq -c . /srv/sydneyscheduler/backend/last_scrape.json 2>/dev/null || cat /srv/sydneyscheduler/backend/last_scrape.json)"
+    LAST_MODIFIED=$(stat -c %Y /srv/sydneyscheduler/backend/last_scrape.json)
     CURRENT_TIME=$(date +%s)
     TIME_DIFF=$((CURRENT_TIME - LAST_MODIFIED))
     HOURS_OLD=$((TIME_DIFF / 3600))
     
     if [ $HOURS_OLD -lt 12 ]; then
-        echo "✅ Results file is recent (${HOURS_OLD} hours old)"
+        echo "✅ Last scrape is recent (${HOURS_OLD} hours ago)"
     else
-        echo "⚠️  Results file is old (${HOURS_OLD} hours old)"
+        echo "⚠️  Last scrape is old (${HOURS_OLD} hours ago)"
     fi
 else
-    echo "❌ Results file not found"
+    echo "❌ No scrape recorded yet (last_scrape.json not found)"
 fi
 
 echo ""
@@ -154,14 +160,14 @@ if [ ! -f /var/log/webscraper/cron.log ]; then
 fi
 
 # Check recent activity
-if [ -f /srv/sydneyscheduler/backend/latest_results.json ]; then
-    LAST_MODIFIED=$(stat -c %Y /srv/sydneyscheduler/backend/latest_results.json)
+if [ -f /srv/sydneyscheduler/backend/last_scrape.json ]; then
+    LAST_MODIFIED=$(stat -c %Y /srv/sydneyscheduler/backend/last_scrape.json)
     CURRENT_TIME=$(date +%s)
     TIME_DIFF=$((CURRENT_TIME - LAST_MODIFIED))
     HOURS_OLD=$((TIME_DIFF / 3600))
     
     if [ $HOURS_OLD -gt 24 ]; then
-        echo "⚠️  Results are more than 24 hours old - cron may not be working"
+        echo "⚠️  Last scrape was more than 24 hours ago - cron may not be working"
         ISSUES=$((ISSUES + 1))
     fi
 fi
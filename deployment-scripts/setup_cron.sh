@@ -1,6 +1,8 @@
 #!/bin/bash
 # Fix and Setup Cron Job for Web Scraper
 # Run this on your DigitalOcean server
+# Not needed if the backend runs with SCRAPE_SCHEDULER=1 (built-in scheduler);
+# running both would scrape twice as often.
 
 echo "🔧 Setting up Cron Job for Web Scraper"
 echo "====================================="
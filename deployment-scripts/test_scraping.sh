@@ -29,7 +29,8 @@ CURRENT_COUNT=$(echo "$CURRENT_RESULTS" | jq '. | length' 2>/dev/null || echo "0
 echo "   Current roster entries: $CURRENT_COUNT"
 
 if [ -f /srv/sydneyscheduler/backend/latest_results.json ]; then
-    echo "   Last updated: $(stat -c %y /srv/sydneyscheduler/backend/latest_results.json)"
+    echo "   Last changed: $(stat -c %y /srv/sydneyscheduler/backend/latest_results.json)"
+    echo "   Last scrape:  $(stat -c %y /srv/sydneyscheduler/backend/last_scrape.json 2>/dev/null || echo never)"
 fi
 
 echo ""
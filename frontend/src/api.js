@@ -21,3 +21,49 @@ export async function triggerScrape() {
   if (!response.ok) throw new Error("Failed to trigger scrape");
   return response.json();
 }
+
+// Subscribe to roster deltas pushed by the backend (server-sent events).
+// onChanges receives {version, timestamp, venues: {venue: {added, removed, changed}}};
+// onReset is called when the client missed changes and should refetch /results.
+// Returns a function that closes the stream.
+export function subscribeToRosterChanges(onChanges, onReset) {
+  const baseUrl = getBaseUrl();
+  const source = new EventSource(`${baseUrl}/results/stream`);
+  let feedId = null;
+  let resetSent = false;
+  const reset = () => {
+    if (onReset && !resetSent) onReset();
+    resetSent = true;
+  };
+  // Sent on every (re)connect; a new feed id means the server restarted and versions started over
+  source.addEventListener("hello", (event) => {
+    const hello = JSON.parse(event.data);
+    resetSent = false;
+    if (feedId !== null && hello.feed_id !== feedId) reset();
+    feedId = hello.feed_id;
+  });
+  source.addEventListener("reset", reset);
+  source.addEventListener("changes", (event) => onChanges(JSON.parse(event.data)));
+  return () => source.close();
+}
+
+// Who is working now, parsed and indexed server-side: [{venue, date, name, shift, start, end, ...}]
+export async function fetchOnNow(venue) {
+  const baseUrl = getBaseUrl();
+  const query = venue ? `?venue=${encodeURIComponent(venue)}` : "";
+  const response = await fetch(`${baseUrl}/results/on-now${query}`);
+  if (!response.ok) throw new Error("Failed to fetch who is on now");
+  return (await response.json()).entries;
+}
+
+// Shifts overlapping a time window, e.g. fetchShifts({from: "6pm", to: "2am", date: "2025-01-31"})
+export async function fetchShifts({ date, from, to, venue } = {}) {
+  const baseUrl = getBaseUrl();
+  const params = new URLSearchParams();
+  Object.entries({ date, from, to, venue }).forEach(([key, value]) => {
+    if (value) params.set(key, value);
+  });
+  const response = await fetch(`${baseUrl}/results/shifts?${params}`);
+  if (!response.ok) throw new Error("Failed to fetch shifts");
+  return (await response.json()).entries;
+}